@@ -1,20 +1,45 @@
+import importlib
+
 from Dragon.utils import *
 
-from Dragon.scan import ScanAllTx
-from Dragon.traders import TopTraders
-from Dragon.holders import TopHolders
-from Dragon.bundle import BundleFinder
-from Dragon.wallet import BulkWalletChecker
-from Dragon.timestamp import TimestampTransactions
-from Dragon.copyWalletFinder import CopyTradeWalletFinder
-from Dragon.earlyBuyers import EarlyBuyers
+# Everything below is imported on first access (PEP 562), so a run that uses
+# one module only loads that module and what it depends on.
+lazyNames = {
+    "ScanAllTx": "Dragon.scan",
+    "TopTraders": "Dragon.traders",
+    "TopHolders": "Dragon.holders",
+    "BundleFinder": "Dragon.bundle",
+    "BulkWalletChecker": "Dragon.wallet",
+    "TimestampTransactions": "Dragon.timestamp",
+    "CopyTradeWalletFinder": "Dragon.copyWalletFinder",
+    "EarlyBuyers": "Dragon.earlyBuyers",
+
+    "EthBulkWalletChecker": "Dragon.ethWallet",
+    "EthTopTraders": "Dragon.ethTraders",
+    "EthTimestampTransactions": "Dragon.ethTimestamp",
+    "EthScanAllTx": "Dragon.ethScan",
+
+    "BscTopTraders": "Dragon.bscTraders",
+    "BscBulkWalletChecker": "Dragon.bscWallet",
+
+    "GMGN": "Dragon.gmgn",
+    "walletPipeline": "Dragon.pipeline",
+
+    "responseCache": "Dragon.cache",
+    "runBudget": "Dragon.retry",
+}
+
 
-from Dragon.ethWallet import EthBulkWalletChecker
-from Dragon.ethTraders import EthTopTraders
-from Dragon.ethTimestamp import EthTimestampTransactions
-from Dragon.ethScan import EthScanAllTx
+def __getattr__(name):
+    if name in lazyNames:
+        value = getattr(importlib.import_module(lazyNames[name]), name)
+    elif name in ("engine", "transport"):
+        value = importlib.import_module(f"Dragon.{name}")
+    else:
+        raise AttributeError(f"module 'Dragon' has no attribute '{name}'")
+    globals()[name] = value
+    return value
 
-from Dragon.bscTraders import BscTopTraders
-from Dragon.bscWallet import BscBulkWalletChecker
 
-from Dragon.gmgn import GMGN
+def __dir__():
+    return sorted(set(globals()) | set(lazyNames) | {"engine", "transport"})
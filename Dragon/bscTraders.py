@@ -1,131 +1,32 @@
 import json
-import time
-import random
-import tls_client
 
-from fake_useragent import UserAgent
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from collections import defaultdict
+from Dragon import engine, transport
+from Dragon.proxies import proxyRegistry
 
-ua = UserAgent(os='linux', browsers=['firefox'])
 
 class BscTopTraders:
 
     def __init__(self):
-        self.sendRequest = tls_client.Session(client_identifier='chrome_103')
-        
         self.shorten = lambda s: f"{s[:4]}...{s[-5:]}" if len(s) >= 9 else s
         self.allData = {}
         self.allAddresses = set()
         self.addressFrequency = defaultdict(int)
         self.totalTraders = 0
-        self.proxyPosition = 0
     
-    def randomise(self):
-        self.identifier = random.choice(
-            [browser for browser in tls_client.settings.ClientIdentifiers.__args__
-             if browser.startswith(('chrome', 'safari', 'firefox', 'opera'))]
-        )
-        parts = self.identifier.split('_')
-        identifier, version, *rest = parts
-        identifier = identifier.capitalize()
-        
-        self.sendRequest = tls_client.Session(random_tls_extension_order=True, client_identifier=self.identifier)
-        self.sendRequest.timeout_seconds = 60
-
-        if identifier == 'Opera':
-            identifier = 'Chrome'
-            osType = 'Windows'
-        elif version.lower() == 'ios':
-            osType = 'iOS'
-        else:
-            osType = 'Windows'
-
-        try:
-            self.user_agent = UserAgent(os=[osType]).random
-        except Exception:
-            self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:82.0) Gecko/20100101 Firefox/82.0"
-
-        self.headers = {
-            'Host': 'gmgn.ai',
-            'accept': 'application/json, text/plain, */*',
-            'accept-language': 'fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7',
-            'dnt': '1',
-            'priority': 'u=1, i',
-            'referer': 'https://gmgn.ai/?chain=sol',
-            'user-agent': self.user_agent
-        }
-
-
-    def loadProxies(self):
-        with open("Dragon/data/Proxies/proxies.txt", 'r') as file:
-            proxies = file.read().splitlines()
-
-        formatted_proxies = []
-        for proxy in proxies:
-            if ':' in proxy:  
-                parts = proxy.split(':')
-                if len(parts) == 4:
-                    ip, port, username, password = parts
-                    formatted_proxies.append({
-                        'http': f"http://{username}:{password}@{ip}:{port}",
-                        'https': f"http://{username}:{password}@{ip}:{port}"
-                    })
-                else:
-                    formatted_proxies.append({
-                        'http': f"http://{proxy}",
-                        'https': f"http://{proxy}"
-                    })
-            else:
-                formatted_proxies.append(f"http://{proxy}")        
-        return formatted_proxies
-
-    def configureProxy(self, proxy):
-        if isinstance(proxy, dict): 
-            self.sendRequest.proxies = {
-                'http': proxy.get('http'),
-                'https': proxy.get('https')
-            }
-        elif isinstance(proxy, str):
-            self.sendRequest.proxies = {
-                'http': proxy,
-                'https': proxy
-            }
-        else:
-            self.sendRequest.proxies = None
-        return proxy
-    
-    def getNextProxy(self):
-        proxies = self.loadProxies()
-        proxy = proxies[self.proxyPosition % len(proxies)]
-        self.proxyPosition += 1
-        return proxy
-
     def fetchTopTraders(self, contractAddress: str, useProxies):
         url = f"http://172.86.110.62:1337/vas/api/v1/token_traders/bsc/{contractAddress}?orderby=realized_profit&direction=desc"
-        retries = 3
 
-        for attempt in range(retries):
-            try:
-                self.randomise()
-                proxy = self.getNextProxy() if useProxies else None
-                self.configureProxy(proxy)
-                response = self.sendRequest.get(url, headers=self.headers, allow_redirects=True)
-                json_data = response.json()
-                data_obj = json_data.get('data', None)
-                data = data_obj.get('list', None) if data_obj else None
-                if data:
-                    return data
-            except Exception as e:
-                print(f"[🐲] Error fetching data on attempt, trying backup... {e}")
-                    
-            time.sleep(1)
-        
-        print(f"[🐲] Failed to fetch data after {retries} attempts.")
-        return []
+        try:
+            data = transport.getJson(url, proxy=proxyRegistry.next if useProxies else None, accept=lambda payload: (payload.get('data') or {}).get('list'))
+        except Exception as e:
+            print(f"[🐲] Failed to fetch data for contract {contractAddress}: {e}")
+            return []
+        return data['data']['list']
 
     def topTraderData(self, contractAddresses, threads, useProxies):
-        with ThreadPoolExecutor(max_workers=threads) as executor:
+        with ThreadPoolExecutor(max_workers=engine.threadWorkers(threads)) as executor:
             futures = {executor.submit(self.fetchTopTraders, address, useProxies): address for address in contractAddresses}
             
             for future in as_completed(futures):
@@ -1,51 +1,24 @@
+import os
+import csv
 import json
 import random
-import tls_client
 
-from fake_useragent import UserAgent
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from Dragon import engine, pagination, transport
+from Dragon.proxies import proxyRegistry
 
 #test5
 
-ua = UserAgent(os='linux', browsers=['firefox'])
+# Seconds after the first trade in which same-slot buys count as a bundle.
+launchWindow = 60
+
 
 class BundleFinder:
 
     def __init__(self):
-        self.txHashes = set()
         self.formatTokens = lambda x: float(x) / 1_000_000
-        self.sendRequest = tls_client.Session(client_identifier='chrome_103')
-        
         self.shorten = lambda s: f"{s[:4]}...{s[-5:]}" if len(s) >= 9 else "?"
     
-    def randomise(self):
-        self.identifier = random.choice([browser for browser in tls_client.settings.ClientIdentifiers.__args__ if browser.startswith(('chrome', 'safari', 'firefox', 'opera'))])
-        self.sendRequest = tls_client.Session(random_tls_extension_order=True, client_identifier=self.identifier)
-
-        parts = self.identifier.split('_')
-        identifier, version, *rest = parts
-        other = rest[0] if rest else None
-        
-        os = 'windows'
-        if identifier == 'opera':
-            identifier = 'chrome'
-        elif version == 'ios':
-            os = 'ios'
-        else:
-            os = 'windows'
-
-        self.user_agent = UserAgent(browsers=[identifier], os=[os]).random
-
-        self.headers = {
-            'Host': 'gmgn.ai',
-            'accept': 'application/json, text/plain, */*',
-            'accept-language': 'fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7',
-            'dnt': '1',
-            'priority': 'u=1, i',
-            'referer': 'https://gmgn.ai/?chain=sol',
-            'user-agent': self.user_agent
-        }
-    
     def prettyPrint(self, bundleData: dict, contractAddress: str):
         isBundled = bundleData['bundleDetected']
         developerInformation = bundleData['developerInfo']
@@ -69,31 +42,41 @@ class BundleFinder:
 
         return text
 
-    def teamTrades(self, contractAddress):
+    def teamTrades(self, contractAddress, useProxies=False):
         url = f"http://172.86.110.62:1337/defi/quotation/v1/trades/sol/{contractAddress}?limit=100&maker=&tag%5B%5D=creator&tag%5B%5D=dev_team"
-        retries = 3
-        
-        for attempt in range(retries):
-            self.randomise()
-            try:
-                info = self.sendRequest.get(f"http://172.86.110.62:1337/defi/quotation/v1/tokens/sol/{contractAddress}", headers=self.headers, allow_redirects=True).json()
-                response = self.sendRequest.get(url, headers=self.headers, allow_redirects=True).json()['data']['history']
-                break
-            except Exception:
-                print(f"[🐲] Error fetching data on attempt, trying backup..")
-            
-            time.sleep(1)  
-
+        proxy = proxyRegistry.next if useProxies else None
+        info = transport.getJson(f"http://172.86.110.62:1337/defi/quotation/v1/tokens/sol/{contractAddress}", proxy=proxy, accept=lambda payload: payload.get('data', {}).get('token'))['data']['token']
+        response = transport.getJson(url, proxy=proxy, accept=lambda payload: isinstance(payload.get('data', {}).get('history'), list))['data']['history']
 
         totalSupply = info['total_supply']
+        txHashes = set()
     
         for buy in response:
             if buy['event'] == "buy":
-                self.txHashes.add(buy['tx_hash'])
+                txHashes.add(buy['tx_hash'])
+
+        return txHashes, totalSupply
+
+    def transfers(self, txHash: str):
+        url = f"https://api.solana.fm/v0/transfers/{txHash}"
+        try:
+            return transport.getJson(url, headers={}, accept=lambda payload: payload.get('result', {}).get('data'))['result']['data']
+        except Exception as e:
+            print(f"[🐲] Error fetching transaction data for {txHash}: {e}")
+            return []
 
-        return self.txHashes, totalSupply
+    def transfersFor(self, txHashes, threads: int = 16) -> dict:
+        # Each hash is fetched once and all of them at the same time. A confirmed
+        # transaction never changes, so solana.fm responses are kept in the
+        # response cache with no expiry and a re-check costs no requests at all.
+        unique = list(dict.fromkeys(txHashes))
+        if threads <= 1 or len(unique) <= 1:
+            return {txHash: self.transfers(txHash) for txHash in unique}
+        with ThreadPoolExecutor(max_workers=min(threads, len(unique))) as executor:
+            return dict(zip(unique, executor.map(self.transfers, unique)))
 
-    def checkBundle(self, txHashes: set, totalSupply: int):
+    def checkBundle(self, txHashes: set, totalSupply: int, threads: int = 16):
+        allTransfers = self.transfersFor(txHashes, threads)
         total_amount = 0.00
         transactions = 0
 
@@ -104,19 +87,7 @@ class BundleFinder:
             "transactionDetails": {}
         }
 
-        for txHash in self.txHashes:
-            url = f"https://api.solana.fm/v0/transfers/{txHash}"
-            retries = 3
-            
-            for attempt in range(retries):
-                try:
-                    response = self.sendRequest.get(url).json().get('result', {}).get('data', [])
-                    if response:
-                        break
-                except Exception as e:
-                    print(f"[🐲] Error fetching transaction data for {txHash} on attempt {attempt + 1}.")
-                time.sleep(1)
-
+        for response in allTransfers.values():
             if isinstance(response, list):
                 for action in response:
                     if action.get('action') == "transfer" and action.get("token") != "":
@@ -132,18 +103,7 @@ class BundleFinder:
 
         transactionsDetails = {}
 
-        for txHash in txHashes:
-            url = f"https://api.solana.fm/v0/transfers/{txHash}"
-            
-            for attempt in range(retries):
-                try:
-                    response = self.sendRequest.get(url).json().get('result', {}).get('data', [])
-                    if response:
-                        break
-                except Exception as e:
-                    print(f"Error fetching transaction data for {txHash} on attempt {attempt + 1}.")
-                time.sleep(1)
-
+        for txHash, response in allTransfers.items():
             if isinstance(response, list):
                 amounts = []
                 for action in response:    
@@ -168,3 +128,165 @@ class BundleFinder:
         data['developerInfo'] = developerInfo
         
         return data
+
+    def tradePage(self, url: str, useProxies):
+        try:
+            data = transport.getJson(url, proxy=proxyRegistry.next if useProxies else None,
+                                     accept=lambda payload: isinstance(payload.get('data', {}).get('history'), list))['data']
+        except Exception as e:
+            print(f"[🐲] Failed to fetch data for URL {url}: {e}")
+            return [], None
+        return data['history'], data.get('next')
+
+    def launchTrades(self, contractAddress: str, pages: int, useProxies, window: int):
+        # Trades from the launch on, read oldest first (revert=true) until the
+        # first `window` seconds are covered, for at most `pages` pages.
+        # Returns (trades oldest first, reachedLaunch, coveredWindow). Should the
+        # endpoint ignore revert and answer newest first, the launch is only
+        # reached when the whole history fits in `pages` pages.
+        url = f"http://172.86.110.62:1337/vas/api/v1/token_trades/sol/{contractAddress}?limit=100&revert=true"
+        trades, ended = [], False
+        for index, (history, cursor) in enumerate(pagination.iterPages(url, lambda pageUrl: self.tradePage(pageUrl, useProxies), prefetch=False)):
+            if not history:
+                break
+            trades.extend(history)
+            if not cursor:
+                ended = True
+                break
+            if trades[0]['timestamp'] <= trades[-1]['timestamp'] and trades[-1]['timestamp'] > trades[0]['timestamp'] + window:
+                break
+            if index + 1 >= pages:
+                break
+        if not trades:
+            return [], False, False
+
+        reachedLaunch = ended or trades[0]['timestamp'] <= trades[-1]['timestamp']
+        trades.sort(key=lambda trade: trade['timestamp'])
+        coveredWindow = ended or trades[-1]['timestamp'] > trades[0]['timestamp'] + window
+        return trades, reachedLaunch, coveredWindow
+
+    def sameSlotClusters(self, trades: list, minMakers: int = 3, launchWindow=None) -> list:
+        # Groups buys by slot (or block) and returns every group in which at
+        # least `minMakers` distinct wallets bought, oldest first. Buys without
+        # a slot are left out: a busy token has many buyers in the same second
+        # without any of them sharing a slot. With launchWindow only buys within
+        # that many seconds of the first trade are considered.
+        try:
+            import numpy as np
+        except ImportError:
+            raise RuntimeError("[🐲] Same-slot bundle detection requires numpy (pip install numpy).")
+        if not trades:
+            return []
+        launch = min(trade['timestamp'] for trade in trades)
+        buys = [trade for trade in trades if trade.get('event') == "buy" and (trade.get('slot') or trade.get('block'))
+                and (launchWindow is None or trade['timestamp'] <= launch + launchWindow)]
+        if not buys:
+            return []
+
+        slots = np.array([trade.get('slot') or trade.get('block') for trade in buys], dtype=np.int64)
+        makers, makerIds = np.unique(np.array([trade['maker'] for trade in buys]), return_inverse=True)
+
+        # Distinct (slot, maker) pairs packed into one integer, then distinct makers per slot.
+        pairs = np.unique(slots * len(makers) + makerIds)
+        clusterSlots, makerCounts = np.unique(pairs // len(makers), return_counts=True)
+        flagged = clusterSlots[makerCounts >= minMakers]
+
+        clusters = []
+        for slot in flagged:
+            indices = np.flatnonzero(slots == slot)
+            clusters.append({
+                "slot": int(slot),
+                "makers": sorted(set(makers[makerIds[indices]].tolist())),
+                "txHashes": sorted({buys[index]['tx_hash'] for index in indices}),
+                "baseAmount": float(sum(float(buys[index].get('base_amount') or 0) for index in indices)),
+            })
+        return clusters
+
+    def slotSummary(self, contractAddress: str, pages: int, useProxies, minMakers: int = 3, launchWindow: int = launchWindow) -> dict:
+        # bundleDetected is True or False only when the trades read start at the
+        # launch and carry slots; otherwise it is "unknown", with the reason in error.
+        trades, reachedLaunch, coveredWindow = self.launchTrades(contractAddress, pages, useProxies, launchWindow)
+        clusters = self.sameSlotClusters(trades, minMakers, launchWindow)
+        launch = trades[0]['timestamp'] if trades else 0
+        slotted = any((trade.get('slot') or trade.get('block')) and trade['timestamp'] <= launch + launchWindow for trade in trades)
+
+        error = ""
+        if not trades:
+            error = "no trades"
+        elif not reachedLaunch:
+            error = f"launch not reached in {pages} pages"
+        elif not slotted:
+            error = "trades carry no slot"
+        elif not clusters and not coveredWindow:
+            error = f"launch window not covered in {pages} pages"
+
+        return {
+            "contractAddress": contractAddress,
+            "bundleDetected": "unknown" if error else bool(clusters),
+            "transactions": sum(len(cluster['txHashes']) for cluster in clusters),
+            "bundledWallets": len({maker for cluster in clusters for maker in cluster['makers']}),
+            "clusters": len(clusters),
+            "reachedLaunch": reachedLaunch,
+            "error": error,
+            "clusterDetails": clusters,
+        }
+
+    def summary(self, contractAddress: str, threads: int, useProxies=False) -> dict:
+        txHashes, totalSupply = self.teamTrades(contractAddress, useProxies)
+        bundleData = self.checkBundle(txHashes, totalSupply, threads)
+        return {
+            "contractAddress": contractAddress,
+            "bundleDetected": bundleData['bundleDetected'],
+            "transactions": bundleData['transactions'],
+            "teamBuys": len(txHashes),
+            "bundledAmount": bundleData['developerInfo']['bundledAmount'],
+            "percentageOfSupply": bundleData['developerInfo']['percentageOfSupply'],
+            "error": "",
+            "transactionDetails": bundleData['transactionDetails'],
+        }
+
+    def checkTokens(self, contractAddresses: list, threads: int, sameSlot=False, pages: int = 5, useProxies=False, window: int = launchWindow):
+        # Tokens are checked concurrently; every request still goes through the
+        # shared per-host limiter. The token pool is the only pool: each worker
+        # fetches its token's pages and transfers in turn. Each result is
+        # written as soon as it is in, one row per token, so an interrupted
+        # batch keeps what it finished. With sameSlot the verdict comes from
+        # the first `window` seconds of trade history alone, read in at most
+        # `pages` pages, without any solana.fm lookups.
+        contractAddresses = list(dict.fromkeys(address.strip() for address in contractAddresses if address.strip()))
+        if sameSlot:
+            columns = ["contractAddress", "bundleDetected", "transactions", "bundledWallets", "clusters", "reachedLaunch", "error"]
+            check = lambda address: self.slotSummary(address, pages, useProxies, launchWindow=window)
+        else:
+            columns = ["contractAddress", "bundleDetected", "transactions", "teamBuys", "bundledAmount", "percentageOfSupply", "error"]
+            check = lambda address: self.summary(address, 1, useProxies)
+        identifier = f"bundles_{random.randint(1111, 9999)}"
+        os.makedirs("Dragon/data/Solana/bundleData", exist_ok=True)
+        bundled = unknown = 0
+
+        with open(f"Dragon/data/Solana/bundleData/{identifier}.jsonl", "w") as jsonFile, \
+             open(f"Dragon/data/Solana/bundleData/{identifier}.csv", "w", newline='') as csvFile:
+            writer = csv.DictWriter(csvFile, fieldnames=columns, extrasaction='ignore')
+            writer.writeheader()
+
+            with ThreadPoolExecutor(max_workers=engine.threadWorkers(min(threads, len(contractAddresses)))) as executor:
+                futures = {executor.submit(check, address): address for address in contractAddresses}
+                for future in as_completed(futures):
+                    try:
+                        row = future.result()
+                    except Exception as e:
+                        row = {"contractAddress": futures[future], "error": str(e)}
+                        print(f"[🐲] Could not check {futures[future]}: {e}")
+                    else:
+                        bundled += row['bundleDetected'] is True
+                        unknown += row['bundleDetected'] == "unknown"
+                        detail = f"Wallets: {row['bundledWallets']:,}" if sameSlot else f"Supply: {row['percentageOfSupply'] * 100:,.2f}%"
+                        verdict = {True: '✅', False: '❌'}.get(row['bundleDetected'], f"❔ ({row['error']})")
+                        print(f"[🐲] {row['contractAddress']} | Bundled: {verdict} | "
+                              f"Transactions: {row['transactions']:,} | {detail}")
+                    jsonFile.write(json.dumps(row) + "\n")
+                    writer.writerow(row)
+                    jsonFile.flush()
+                    csvFile.flush()
+
+        print(f"[🐲] {bundled} of {len(contractAddresses)} tokens bundled, {unknown} unknown. Saved results to {identifier}.jsonl and {identifier}.csv")
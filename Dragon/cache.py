@@ -0,0 +1,163 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from Dragon import endpoints
+
+cachePath = os.path.join("Dragon", "data", "cache.sqlite3")
+
+# Seconds a response stays fresh per endpoint class. 0 disables caching for
+# live data (rankings, trade pages); None keeps the entry until evicted, for
+# data that can never change once it exists, like a confirmed transaction.
+endpointTtls = {
+    "walletNew": 3 * 3600,
+    "tokenDistro": 3 * 3600,
+    "tokenInfo": 24 * 3600,
+    "poolInfo": 24 * 3600,
+    "topTraders": 30 * 60,
+    "topHolders": 10 * 60,
+    "tokenTrades": 0,
+    "trades": 0,
+    "rank": 0,
+    "transfers": None,
+    "default": 0,
+}
+
+maxBytes = 256 * 1024 * 1024
+evictEvery = 500
+
+
+def normaliseUrl(url: str) -> str:
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+
+
+class CachedResponse:
+
+    def __init__(self, status_code: int, text: str):
+        self.status_code = status_code
+        self.text = text
+        self.headers: Dict[str, str] = {}
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class ResponseCache:
+
+    def __init__(self, path: str = cachePath):
+        self.path = path
+        self.enabled = True
+        self.maxAge: Optional[float] = None
+        self.local = threading.local()
+        self.writes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, enabled: bool = True, maxAge: Optional[float] = None):
+        self.enabled = enabled
+        self.maxAge = maxAge
+        return self
+
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, endpoint TEXT, status INTEGER, body TEXT, "
+                "stored REAL, accessed REAL, size INTEGER)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS responsesAccessed ON responses (accessed)")
+            self.local.connection = connection
+        return connection
+
+    def ttlFor(self, endpoint: str) -> Optional[float]:
+        ttl = endpointTtls.get(endpoint, endpointTtls["default"])
+        if ttl == 0 or self.maxAge is None:
+            return ttl
+        return self.maxAge if ttl is None else min(ttl, self.maxAge)
+
+    def cacheable(self, url: str) -> bool:
+        return self.enabled and self.ttlFor(endpoints.classify(url)) != 0
+
+    def lookup(self, url: str) -> Optional[CachedResponse]:
+        if not self.cacheable(url):
+            return None
+
+        ttl = self.ttlFor(endpoints.classify(url))
+        key = normaliseUrl(url)
+        try:
+            connection = self.connection()
+            row = connection.execute("SELECT status, body, stored FROM responses WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is None or (ttl is not None and now - row[2] > ttl):
+                self.misses += 1
+                return None
+            connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        except sqlite3.Error:
+            return None
+
+        self.hits += 1
+        return CachedResponse(row[0], row[1])
+
+    def store(self, url: str, statusCode: int, body: str) -> None:
+        if statusCode != 200 or not body or not self.cacheable(url):
+            return
+
+        now = time.time()
+        try:
+            self.connection().execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, status, body, stored, accessed, size) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (normaliseUrl(url), endpoints.classify(url), statusCode, body, now, now, len(body))
+            )
+        except sqlite3.Error:
+            return
+
+        with self.lock:
+            self.writes += 1
+            evict = self.writes % evictEvery == 0
+        if evict:
+            self.evict()
+
+    def discard(self, url: str) -> None:
+        if not self.cacheable(url):
+            return
+        try:
+            self.connection().execute("DELETE FROM responses WHERE key = ?", (normaliseUrl(url),))
+        except sqlite3.Error:
+            pass
+
+    def evict(self) -> None:
+        # Least recently used entries go first until the cache fits in maxBytes.
+        try:
+            connection = self.connection()
+            total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= maxBytes:
+                return
+            excess = total - maxBytes
+            freed = 0
+            keys = []
+            for key, size in connection.execute("SELECT key, size FROM responses ORDER BY accessed"):
+                keys.append((key,))
+                freed += size
+                if freed >= excess:
+                    break
+            connection.executemany("DELETE FROM responses WHERE key = ?", keys)
+        except sqlite3.Error:
+            pass
+
+    def clear(self) -> None:
+        self.connection().execute("DELETE FROM responses")
+
+
+responseCache = ResponseCache()
@@ -1,178 +1,174 @@
+import os
+import csv
 import random
-import tls_client
 
-import concurrent.futures
-from fake_useragent import UserAgent
-from threading import Lock
-import time
-import base64
+from collections import Counter, defaultdict, deque
+from typing import Dict, Iterable, List, Optional, Tuple
+from Dragon import pagination, transport
+from Dragon.proxies import proxyRegistry
+from Dragon.tradeStore import tradeStore
 
-ua = UserAgent(os='linux', browsers=['firefox'])
 
 class CopyTradeWalletFinder:
 
     def __init__(self):
-        self.sendRequest = tls_client.Session(client_identifier='chrome_103')
-        
         self.shorten = lambda s: f"{s[:4]}...{s[-5:]}" if len(s) >= 9 else s
-        self.lock = Lock()
-        self.proxyPosition = 0
     
-    def randomise(self):
-        self.identifier = random.choice(
-            [browser for browser in tls_client.settings.ClientIdentifiers.__args__
-             if browser.startswith(('chrome', 'safari', 'firefox', 'opera'))]
-        )
-        parts = self.identifier.split('_')
-        identifier, version, *rest = parts
-        identifier = identifier.capitalize()
-        
-        self.sendRequest = tls_client.Session(random_tls_extension_order=True, client_identifier=self.identifier)
-        self.sendRequest.timeout_seconds = 60
-
-        if identifier == 'Opera':
-            identifier = 'Chrome'
-            osType = 'Windows'
-        elif version.lower() == 'ios':
-            osType = 'iOS'
-        else:
-            osType = 'Windows'
+    def hasHistory(self, payload):
+        return isinstance(payload.get('data', {}).get('history'), list)
 
-        try:
-            self.user_agent = UserAgent(os=[osType]).random
-        except Exception:
-            self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:82.0) Gecko/20100101 Firefox/82.0"
-
-        self.headers = {
-            'Host': 'gmgn.ai',
-            'accept': 'application/json, text/plain, */*',
-            'accept-language': 'fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7',
-            'dnt': '1',
-            'priority': 'u=1, i',
-            'referer': 'https://gmgn.ai/?chain=sol',
-            'user-agent': self.user_agent
-        }
-
-    def loadProxies(self):
-        with open("Dragon/data/Proxies/proxies.txt", 'r') as file:
-            proxies = file.read().splitlines()
-
-        formatted_proxies = []
-        for proxy in proxies:
-            if ':' in proxy:
-                parts = proxy.split(':')
-                if len(parts) == 4:
-                    ip, port, username, password = parts
-                    formatted_proxies.append(f"http://{username}:{password}@{ip}:{port}")
-                elif len(parts) == 2:
-                    ip, port = parts
-                    formatted_proxies.append(f"http://{ip}:{port}")
-        return formatted_proxies
-    
-    def configureProxy(self, proxy):
-        if isinstance(proxy, str):
-            self.sendRequest.proxies = {
-                'http': proxy,
-                'https': proxy
-            }
-        elif isinstance(proxy, dict):
-            self.sendRequest.proxies = proxy
-
-    
-    def getNextProxy(self):
-        proxies = self.loadProxies()
-        if not proxies: 
-            raise Exception("[🐲] Proxy list is empty. Please provide valid proxies in proxies.txt.")
-        proxy = proxies[self.proxyPosition % len(proxies)]
-        self.proxyPosition += 1
-        return proxy
+    def buysUrl(self, contractAddress: str):
+        return f"http://172.86.110.62:1337/defi/quotation/v1/trades/sol/{contractAddress}?limit=100&event=buy"
 
     def request(self, url: str, useProxies):
-        retries = 3
-
-        for attempt in range(retries):
-            self.randomise()
-            try:
-                proxy = self.getNextProxy() if useProxies else None
-                self.configureProxy(proxy)
-                response = self.sendRequest.get(url, headers=self.headers, allow_redirects=True)
-                if response.status_code == 200:
-                    data = response.json()['data']['history']
-                    paginator = response.json()['data'].get('next')
-                    return data, paginator
-            except Exception:
-                print(f"[🐲] Error fetching data, trying backup...")
-
-            time.sleep(1)
-
-        print(f"[🐲] Failed to fetch data after {retries} attempts for URL: {url}")
-        return [], None
-
-    def findWallets(self, contractAddress: str, targetMaker: str, threads: int, useProxies):
-        base_url = f"http://172.86.110.62:1337/defi/quotation/v1/trades/sol/{contractAddress}?limit=100&event=buy"
-        paginator = None
-        urls = []
+        try:
+            data = transport.getJson(url, proxy=proxyRegistry.next if useProxies else None, accept=self.hasHistory)['data']
+        except Exception as e:
+            print(f"[🐲] Failed to fetch data for URL {url}: {e}")
+            return [], None
+        return data['history'], data.get('next')
+
+    def findWallets(self, contractAddress: str, targetMaker: str, threads: int, useProxies, count: int = 10):
+        # Pages are read oldest first (revert=true), so the walk stops as soon
+        # as the target's buy and the `count` distinct makers who bought after
+        # it have been read, instead of crawling back from the newest trade.
+        base_url = f"{self.buysUrl(contractAddress)}&revert=true"
+        found_target = False
+        oldest_first = None
+        seen = set()
+        temp_makers = deque(maxlen=count)
 
         print(f"\n[🐲] Starting... please wait.\n")
 
-        while True:
-            self.randomise()
-            url = f"{base_url}&cursor={paginator}" if paginator else base_url
-            urls.append(url)
-            try:
-                proxy = self.getNextProxy() if useProxies else None
-                self.configureProxy(proxy)
-                response = self.sendRequest.get(url, headers=self.headers, allow_redirects=True)
-                if response.status_code != 200:
-                    raise Exception("Error in initial request")
-            except Exception:
-                print(f"[🐲] Error fetching data, trying backup..")
-            time.sleep(1)
-            
-            paginator = response.json()['data'].get('next')
+        for history, paginator in pagination.iterPages(base_url, lambda url: self.request(url, useProxies)):
+            if oldest_first is None and history:
+                oldest_first = history[0]['timestamp'] <= history[-1]['timestamp']
+                if not oldest_first:
+                    # Without revert support the makers ahead of the target are
+                    # the ones read before it; the deque keeps the closest `count`.
+                    print("[🐲] Trades came back newest first, walking back to the target.")
+
+            complete = False
+            for maker in history:
+                event = maker['event']
+                txns = maker.get('total_trade', 0)
+                if event == "buy" and txns < 200:
+                    if maker['maker'] == targetMaker:
+                        found_target = True
+                        if not oldest_first:
+                            complete = True
+                            break
+                        continue
+
+                    if (found_target or not oldest_first) and maker['maker'] not in seen:
+                        seen.add(maker['maker'])
+                        temp_makers.append(maker['maker'])
+                        if found_target and len(temp_makers) == count:
+                            complete = True
+                            break
+
+            if complete:
+                break
 
             if paginator:
-                print(f"[🐲] Page: {base64.b64decode(paginator).decode('utf-8')}")
+                print(f"[🐲] Page: {pagination.decodeCursor(paginator)}")
             else:
                 print("[🐲] Could not find page.")
-                break
 
-        found_target = False
-        temp_makers = []  
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
-            future_to_url = {executor.submit(self.request, url, useProxies): url for url in urls}
-
-            for future in concurrent.futures.as_completed(future_to_url):
-                history, _ = future.result()
-        
-                with self.lock:
-                    for maker in history:
-                        event = maker['event']
-                        txns = maker.get('total_trade', 0)
-                        if event == "buy" and txns < 200:                            
-                            if maker['maker'] == targetMaker:
-                                found_target = True
-                                break
-                            
-                            if maker['maker'] not in temp_makers:
-                                temp_makers.append(maker['maker'])
-
-                if found_target:
-                    break
-
-        makers = temp_makers[-10:]  
+        # Oldest first either way.
+        makers = list(temp_makers) if oldest_first else list(reversed(temp_makers))
 
         if found_target:
             print(f"[🐲] Found target maker: {targetMaker}")
-            print(f"[🐲] The first 10 makers ahead of target maker:")
+            print(f"[🐲] The first {count} makers ahead of target maker:")
             for idx, maker in enumerate(makers, 1):
                 print(f"{idx}. {maker}")
         else:
             print(f"[🐲] Target maker {targetMaker} not found.")
 
         filename = f"wallets_after_{self.shorten(targetMaker)}_{random.randint(1111, 9999)}.txt"
+        os.makedirs("Dragon/data/Solana/CopyWallets", exist_ok=True)
         with open(f"Dragon/data/Solana/CopyWallets/{filename}", "w") as file:
             for maker in makers:
                 file.write(f"{maker}\n")
-        print(f"[🐲] Saved the 10 makers after {targetMaker} to {filename}")
+        print(f"[🐲] Saved the {len(makers)} makers after {targetMaker} to {filename}")
+
+    def tokenBuys(self, contractAddress: str, threads: int, useProxies, useStore=False) -> List[Tuple[int, str]]:
+        # Every (timestamp, maker) buy of the token, oldest first, from one crawl
+        # (or from the local trade store, which only fetches what's new). Both
+        # read the buys endpoint, whose trades carry the maker's total_trade.
+        fetchPage = lambda url: self.request(url, useProxies)
+        base_url = self.buysUrl(contractAddress)
+        if useStore:
+            # Stored apart from the full "sol" token_trades history the
+            # scanners sync, since these pages hold buys only.
+            tradeStore.sync("sol-buys", contractAddress, base_url, fetchPage, threads)
+            trades = tradeStore.trades("sol-buys", contractAddress, event="buy")
+        else:
+            pages = [history for history, _ in pagination.iterPagesParallel(base_url, fetchPage, threads)]
+            trades = (trade for history in reversed(pages) for trade in reversed(history))
+
+        return [(trade['timestamp'], trade['maker']) for trade in trades
+                if trade.get('event') == "buy" and trade.get('total_trade', 0) < 200]
+
+    def followersIn(self, buys: List[Tuple[int, str]], leaders: Iterable[str], seconds: Optional[int], trades: Optional[int]) -> Dict[str, set]:
+        # One sweep over the time-sorted buys. Each leader's first buy opens a
+        # window that closes after `seconds` or `trades` further buys, whichever
+        # comes first; every maker seen while a window is open follows its leader.
+        # Windows all have the same size, so they close in the order they opened.
+        leaders = set(leaders)
+        followers = {}
+        open_windows = deque()
+        for index, (timestamp, maker) in enumerate(buys):
+            while open_windows and (
+                (seconds is not None and timestamp - open_windows[0][1] > seconds) or
+                (trades is not None and index - open_windows[0][2] > trades)
+            ):
+                open_windows.popleft()
+
+            for leader, _, _ in open_windows:
+                if maker != leader:
+                    followers[leader].add(maker)
+
+            if maker in leaders and maker not in followers:
+                followers[maker] = set()
+                open_windows.append((maker, timestamp, index))
+        return followers
+
+    def findCopyTraders(self, contractAddresses: List[str], leaders: List[str], threads: int, useProxies,
+                        seconds: Optional[int] = 60, trades: Optional[int] = None, minTokens: int = 2, useStore=False):
+        leaders = [leader.strip() for leader in leaders if leader.strip()]
+        leaderTokens = Counter()
+        followCounts = defaultdict(Counter)
+
+        print(f"\n[🐲] Starting... please wait.\n")
+
+        for contractAddress in contractAddresses:
+            contractAddress = contractAddress.strip()
+            if not contractAddress:
+                continue
+            buys = self.tokenBuys(contractAddress, threads, useProxies, useStore)
+            followers = self.followersIn(buys, leaders, seconds, trades)
+            print(f"[🐲] {contractAddress}: {len(buys)} buys, {len(followers)} of {len(leaders)} leaders bought.")
+            for leader, makers in followers.items():
+                leaderTokens[leader] += 1
+                followCounts[leader].update(makers)
+
+        rows = []
+        for leader, counts in followCounts.items():
+            for follower, count in counts.most_common():
+                if count < minTokens:
+                    break
+                rows.append([leader, follower, count, leaderTokens[leader], f"{count / leaderTokens[leader]:.2f}"])
+
+        filename = f"copytraders_{random.randint(1111, 9999)}.csv"
+        os.makedirs("Dragon/data/Solana/CopyWallets", exist_ok=True)
+        with open(f"Dragon/data/Solana/CopyWallets/{filename}", "w", newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['leader', 'follower', 'tokens_followed', 'leader_tokens', 'follow_rate'])
+            writer.writerows(rows)
+
+        for leader in leaders:
+            copiers = sum(1 for row in rows if row[0] == leader)
+            print(f"[🐲] {leader}: bought {leaderTokens[leader]} tokens, {copiers} wallets followed in at least {minTokens}.")
+        print(f"[🐲] Saved {len(rows)} leader/follower pairs to {filename}")
@@ -1,14 +1,10 @@
 import json
-import time
-import random
-import tls_client
 
-from fake_useragent import UserAgent
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from collections import defaultdict
-from threading import Event
+from Dragon import engine, transport
+from Dragon.proxies import proxyRegistry
 
-globalRatelimitEvent = Event()
 
 class EarlyBuyers:
 
@@ -18,153 +14,76 @@ class EarlyBuyers:
         self.allAddresses = set()
         self.addressFrequency = defaultdict(int)
         self.totalBuyers = 0
-        self.proxyPosition = 0
 
-    def randomise(self):
-        self.identifier = random.choice(
-            [browser for browser in tls_client.settings.ClientIdentifiers.__args__
-             if browser.startswith(('chrome', 'safari', 'firefox', 'opera'))]
+    def earlyBuyersUrl(self, contractAddress: str):
+        return f"http://172.86.110.62:1337/vas/api/v1/token_trades/sol/{contractAddress}?revert=true"
+
+    def hasEarlyBuy(self, payload):
+        history = payload.get('data', {}).get('history', [])
+        return isinstance(history, list) and any(
+            item.get('event') == "buy" and "creator" not in (item.get('maker_token_tags') or []) for item in history
         )
-        parts = self.identifier.split('_')
-        identifier, version, *rest = parts
-        identifier = identifier.capitalize()
-        
-        self.sendRequest = tls_client.Session(random_tls_extension_order=True, client_identifier=self.identifier)
-        self.sendRequest.timeout_seconds = 60
-
-        if identifier == 'Opera':
-            identifier = 'Chrome'
-            osType = 'Windows'
-        elif version.lower() == 'ios':
-            osType = 'iOS'
-        else:
-            osType = 'Windows'
 
+    def fetchEarlyBuyers(self, contractAddress: str, useProxies, buyers):
         try:
-            self.user_agent = UserAgent(os=[osType]).random
-        except Exception:
-            self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:82.0) Gecko/20100101 Firefox/82.0"
-
-        self.headers = {
-            'Host': 'gmgn.ai',
-            'accept': 'application/json, text/plain, */*',
-            'accept-language': 'fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7',
-            'dnt': '1',
-            'priority': 'u=1, i',
-            'referer': 'https://gmgn.ai/?chain=sol',
-            'user-agent': self.user_agent
-        }
-
-    def loadProxies(self):
-        with open("Dragon/data/Proxies/proxies.txt", 'r') as file:
-            proxies = file.read().splitlines()
-
-        formatted_proxies = []
-        for proxy in proxies:
-            if ':' in proxy:
-                parts = proxy.split(':')
-                if len(parts) == 4:
-                    ip, port, username, password = parts
-                    formatted_proxies.append({
-                        'http': f"http://{username}:{password}@{ip}:{port}",
-                        'https': f"http://{username}:{password}@{ip}:{port}"
-                    })
-                else:
-                    formatted_proxies.append({
-                        'http': f"http://{proxy}",
-                        'https': f"http://{proxy}"
-                    })
-            else:
-                formatted_proxies.append(f"http://{proxy}")
-        return formatted_proxies
-
-    def configureProxy(self, proxy):
-        if isinstance(proxy, dict):
-            self.sendRequest.proxies = {
-                'http': proxy.get('http'),
-                'https': proxy.get('https')
-            }
-        elif isinstance(proxy, str):
-            self.sendRequest.proxies = {
-                'http': proxy,
-                'https': proxy
-            }
-        else:
-            self.sendRequest.proxies = None
-        return proxy
-
-    def getNextProxy(self):
-        proxies = self.loadProxies()
-        proxy = proxies[self.proxyPosition % len(proxies)]
-        self.proxyPosition += 1
-        return proxy
+            data = transport.getJson(self.earlyBuyersUrl(contractAddress), proxy=proxyRegistry.next if useProxies else None, accept=self.hasEarlyBuy)
+        except Exception as e:
+            print(f"[🐲] Failed to fetch data for contract {contractAddress}: {e}")
+            return []
+        return data['data']['history']
 
-    def fetchEarlyBuyers(self, contractAddress: str, useProxies, buyers):
-        url = f"http://172.86.110.62:1337/vas/api/v1/token_trades/sol/{contractAddress}?revert=true"
-        retries = 3
-
-        for attempt in range(retries):
-            try:
-                if globalRatelimitEvent.is_set():
-                    print(f"[🐲] Global rate limit active. Waiting before fetching early buyers for contract {contractAddress}...")
-                    globalRatelimitEvent.wait()
-                    
-                self.randomise()
-                proxy = self.getNextProxy() if useProxies else None
-                self.configureProxy(proxy)
-                response = self.sendRequest.get(url, headers=self.headers, allow_redirects=True)
-                
-                if response.status_code == 429:
-                    print(f"[🐲] Received 429 for contract {contractAddress}. Triggering global cooldown for 7.5 seconds...")
-                    globalRatelimitEvent.set()
-                    time.sleep(7.5)
-                    globalRatelimitEvent.clear()
-                    continue
-
-                data = response.json().get('data', {}).get('history', [])
-                if isinstance(data, list):
-                    for item in data:
-                        if item.get('event') == "buy" and "creator" not in item.get('maker_token_tags'):
-                            return data
-            except Exception as e:
-                print(f"[🐲] Error fetching data on attempt {attempt+1} for contract {contractAddress}: {e}")
-            time.sleep(1)
-
-        print(f"[🐲] Failed to fetch data after {retries} attempts for contract {contractAddress}.")
-        return []
+    async def fetchEarlyBuyersAsync(self, fetchEngine, contractAddress: str, useProxies, buyers):
+        try:
+            data = await fetchEngine.getJson(self.earlyBuyersUrl(contractAddress), proxy=proxyRegistry.next if useProxies else None, accept=self.hasEarlyBuy)
+        except Exception as e:
+            print(f"[🐲] Failed to fetch data for contract {contractAddress}: {e}")
+            return []
+        return data['data']['history']
+
+    def walletsFor(self, contractAddress: str, useProxies, buyers):
+        return [buyer['maker'] for buyer in self.fetchEarlyBuyers(contractAddress, useProxies, buyers)[:buyers] if buyer.get('maker')]
+
+    def processEarlyBuyers(self, contractAddress, response, buyers):
+        limited_response = response[:buyers] if len(response) >= buyers else response
+
+        if contractAddress not in self.allData:
+            self.allData[contractAddress] = []
+
+        self.totalBuyers += len(limited_response)
+
+        for earlyBuyer in limited_response:
+            address = earlyBuyer.get('maker')
+            if address:
+                self.addressFrequency[address] += 1
+                self.allAddresses.add(address)
+
+                bought_usd = f"${float(earlyBuyer['amount_usd']):,.2f}" if earlyBuyer.get('amount_usd') not in (None, "") else "?"
+                total_profit = f"${float(earlyBuyer['realized_profit']):,.2f}" if earlyBuyer.get('realized_profit') not in (None, "") else "?"
+                unrealized_profit = f"${float(earlyBuyer['unrealized_profit']):,.2f}" if earlyBuyer.get('unrealized_profit') not in (None, "") else "?"
+                trades = str(earlyBuyer.get('total_trade', "?"))
+
+                buyer_data = {
+                    "boughtUsd": bought_usd,
+                    "totalProfit": total_profit,
+                    "unrealizedProfit": unrealized_profit,
+                    "trades": trades,
+                }
+                self.allData[contractAddress].append({address: buyer_data})
 
     def earlyBuyersdata(self, contractAddresses, threads, useProxies, buyers):
-        with ThreadPoolExecutor(max_workers=threads) as executor:
-            futures = {executor.submit(self.fetchEarlyBuyers, address, useProxies, buyers): address for address in contractAddresses}
-
-            for future in as_completed(futures):
-                contract_address = futures[future]
-                response = future.result()
-                limited_response = response[:buyers] if len(response) >= buyers else response
-
-                if contract_address not in self.allData:
-                    self.allData[contract_address] = []
-
-                self.totalBuyers += len(limited_response)
-
-                for earlyBuyer in limited_response:
-                    address = earlyBuyer.get('maker')
-                    if address:
-                        self.addressFrequency[address] += 1
-                        self.allAddresses.add(address)
-
-                        bought_usd = f"${float(earlyBuyer['amount_usd']):,.2f}" if earlyBuyer.get('amount_usd') not in (None, "") else "?"
-                        total_profit = f"${float(earlyBuyer['realized_profit']):,.2f}" if earlyBuyer.get('realized_profit') not in (None, "") else "?"
-                        unrealized_profit = f"${float(earlyBuyer['unrealized_profit']):,.2f}" if earlyBuyer.get('unrealized_profit') not in (None, "") else "?"
-                        trades = str(earlyBuyer.get('total_trade', "?"))
-
-                        buyer_data = {
-                            "boughtUsd": bought_usd,
-                            "totalProfit": total_profit,
-                            "unrealizedProfit": unrealized_profit,
-                            "trades": trades,
-                        }
-                        self.allData[contract_address].append({address: buyer_data})
+        if engine.useAsync(threads):
+            engine.runAll(
+                lambda fetchEngine, address: self.fetchEarlyBuyersAsync(fetchEngine, address, useProxies, buyers),
+                contractAddresses,
+                threads,
+                lambda address, response: self.processEarlyBuyers(address, response, buyers)
+            )
+        else:
+            with ThreadPoolExecutor(max_workers=engine.threadWorkers(threads)) as executor:
+                futures = {executor.submit(self.fetchEarlyBuyers, address, useProxies, buyers): address for address in contractAddresses}
+
+                for future in as_completed(futures):
+                    self.processEarlyBuyers(futures[future], future.result(), buyers)
 
         repeatedAddresses = [address for address, count in self.addressFrequency.items() if count > 1]
 
@@ -0,0 +1,29 @@
+from urllib.parse import urlsplit
+
+# Ordered (name, fragment) pairs, first match wins. Shared by the rate limiter
+# and anything else that needs to treat upstream endpoints differently.
+endpointPatterns = [
+    ("walletNew", "/smartmoney/"),
+    ("tokenDistro", "/unique_token_7d"),
+    ("topTraders", "/top_traders/"),
+    ("topTraders", "/token_traders/"),
+    ("topHolders", "/top_holders/"),
+    ("tokenTrades", "/token_trades/"),
+    ("trades", "/quotation/v1/trades/"),
+    ("poolInfo", "/token_pool_fee_info/"),
+    ("tokenInfo", "/quotation/v1/tokens/"),
+    ("rank", "/quotation/v1/rank/"),
+    ("rank", "/quotation/v1/pairs/"),
+    ("transfers", "api.solana.fm/v0/transfers/"),
+]
+
+
+def classify(url: str) -> str:
+    for name, fragment in endpointPatterns:
+        if fragment in url:
+            return name
+    return "default"
+
+
+def host(url: str) -> str:
+    return urlsplit(url).netloc
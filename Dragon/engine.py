@@ -0,0 +1,164 @@
+import time
+import json
+import random
+import itertools
+import importlib.util
+
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Union
+from Dragon import transport
+from Dragon.cache import normaliseUrl, responseCache
+from Dragon.ratelimit import limiter
+from Dragon.retry import HttpError, InvalidPayload, RetryPolicy, defaultPolicy
+from Dragon.singleflight import AsyncSingleFlight
+
+
+# Above this many workers OS threads stop paying off; the asyncio engine takes
+# over and can keep thousands of requests in flight on a single core.
+threadLimit = 100
+asyncLimit = 5000
+
+
+def available() -> bool:
+    # aiohttp takes longer to import than everything else in a run that never
+    # needs it, so it is only looked up here and imported when an engine starts.
+    return importlib.util.find_spec("aiohttp") is not None
+
+
+def useAsync(concurrency: int) -> bool:
+    return concurrency > threadLimit and available()
+
+
+def threadWorkers(requested: int) -> int:
+    # OS threads for a pool asked to run `requested` workers: never more than
+    # threadLimit, however many the asyncio engine would have taken.
+    return max(1, min(requested, threadLimit))
+
+
+def proxyUrl(proxy: Optional[Union[str, Dict[str, str]]]) -> Optional[str]:
+    if isinstance(proxy, dict):
+        return proxy.get('http') or proxy.get('https')
+    return proxy or None
+
+
+class AsyncResponse:
+
+    def __init__(self, status_code: int, text: str):
+        self.status_code = status_code
+        self.text = text
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+async def offLoop(call: Callable[..., Any], *args) -> Any:
+    # The response cache is SQLite with a commit per write; run it on the
+    # default executor so disk I/O never stalls every request on the loop.
+    import asyncio
+    return await asyncio.get_running_loop().run_in_executor(None, call, *args)
+
+
+class FetchEngine:
+
+    def __init__(self, concurrency: int = 500, timeout: int = 60):
+        if not available():
+            raise RuntimeError("[🐲] The asyncio engine requires aiohttp (pip install aiohttp).")
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.client = None
+        self.semaphore = None
+        self.inFlight = AsyncSingleFlight()
+        self.headers = {
+            **transport.baseHeaders,
+            'user-agent': transport.userAgentFor(random.choice(transport.clientIdentifiers()))
+        }
+
+    async def __aenter__(self):
+        import asyncio
+        import aiohttp
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+        self.client = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.client.close()
+
+    async def fetch(self, url: str, proxy: Optional[Union[str, Dict[str, str]]], headers: Optional[Dict[str, str]], useCache: bool) -> AsyncResponse:
+        requestHeaders = self.headers if headers is None else headers
+        async with self.semaphore:
+            await limiter.acquireAsync(url)
+            started = time.monotonic()
+            async with self.client.get(url, headers=requestHeaders, proxy=proxyUrl(proxy), allow_redirects=True) as response:
+                text = await response.text()
+            limiter.record(url, response.status, time.monotonic() - started, response.headers.get('Retry-After'))
+        if useCache and responseCache.cacheable(url):
+            await offLoop(responseCache.store, url, response.status, text)
+        return AsyncResponse(response.status, text)
+
+    async def get(self, url: str, proxy: Optional[Union[str, Dict[str, str]]] = None, headers: Optional[Dict[str, str]] = None, useCache: bool = True) -> AsyncResponse:
+        cached = await offLoop(responseCache.lookup, url) if useCache and responseCache.cacheable(url) else None
+        if cached is not None:
+            return cached
+
+        return await self.inFlight.do(normaliseUrl(url), lambda: self.fetch(url, proxy, headers, useCache))
+
+    async def getJson(self, url: str, proxy=None, headers: Optional[Dict[str, str]] = None, policy: Optional[RetryPolicy] = None,
+                      accept: Optional[Callable[[Any], bool]] = None) -> Any:
+        # Same contract as transport.getJson.
+        async def attempt():
+            response = await self.get(url, proxy=proxy() if callable(proxy) else proxy, headers=headers)
+            if response.status_code != 200:
+                raise HttpError(response.status_code, url)
+            data = response.json()
+            if accept is not None and not accept(data):
+                await offLoop(responseCache.discard, url)
+                raise InvalidPayload(f"unusable payload from {url}")
+            return data
+
+        return await (policy or defaultPolicy).runAsync(attempt, url)
+
+
+def runAll(worker: Callable[[FetchEngine, Any], Awaitable[Any]], items: Iterable[Any], concurrency: int,
+           callback: Callable[[Any, Any], Optional[Awaitable[None]]]) -> None:
+    # Runs worker(engine, item) for every item with at most `concurrency`
+    # requests in flight, handing each (item, result) to callback as it completes.
+    # Items are pulled one at a time by `concurrency` drain loops sharing one
+    # iterator, so a huge or endless input never becomes a huge task list.
+    # callback runs on the event loop: one that may block should be a
+    # coroutine function, and only its own drain loop waits for it.
+    import asyncio
+
+    async def main():
+        async with FetchEngine(concurrency) as engine:
+            pending = iter(items)
+
+            async def drain():
+                for item in pending:
+                    outcome = callback(item, await worker(engine, item))
+                    if asyncio.iscoroutine(outcome):
+                        await outcome
+
+            await asyncio.gather(*(drain() for _ in range(concurrency)))
+
+    asyncio.run(main())
+
+
+def runThreads(worker: Callable[[Any], Any], items: Iterable[Any], threads: int, callback: Callable[[Any, Any], None], backlog: int = 2) -> None:
+    # Thread pool counterpart of runAll. At most threads * backlog futures
+    # exist at a time; a new item is pulled only when one finishes.
+    # Interrupting cancels whatever is queued instead of draining it.
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    threads = threadWorkers(threads)
+    pending = iter(items)
+    executor = ThreadPoolExecutor(max_workers=threads)
+    try:
+        running = {executor.submit(worker, item): item for item in itertools.islice(pending, threads * backlog)}
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                callback(running.pop(future), future.result())
+            for item in itertools.islice(pending, len(finished)):
+                running[executor.submit(worker, item)] = item
+    finally:
+        executor.shutdown(cancel_futures=True)
@@ -1,165 +1,55 @@
 import random
-import tls_client
 
-import concurrent.futures
-from fake_useragent import UserAgent
 from threading import Lock
-import time
-import base64
+from Dragon import pagination, transport
+from Dragon.proxies import proxyRegistry
+from Dragon.tradeStore import tradeStore
 
-ua = UserAgent(os='linux', browsers=['firefox'])
 
 class EthScanAllTx:
 
     def __init__(self):
-        self.sendRequest = tls_client.Session(client_identifier='chrome_103')
-        
         self.shorten = lambda s: f"{s[:4]}...{s[-5:]}" if len(s) >= 9 else s
         self.lock = Lock()
-        self.proxyPosition = 0
-
-    def randomise(self):
-        self.identifier = random.choice(
-            [browser for browser in tls_client.settings.ClientIdentifiers.__args__
-             if browser.startswith(('chrome', 'safari', 'firefox', 'opera'))]
-        )
-        parts = self.identifier.split('_')
-        identifier, version, *rest = parts
-        identifier = identifier.capitalize()
-        
-        self.sendRequest = tls_client.Session(random_tls_extension_order=True, client_identifier=self.identifier)
-        self.sendRequest.timeout_seconds = 60
-
-        if identifier == 'Opera':
-            identifier = 'Chrome'
-            osType = 'Windows'
-        elif version.lower() == 'ios':
-            osType = 'iOS'
-        else:
-            osType = 'Windows'
-
-        try:
-            self.user_agent = UserAgent(os=[osType]).random
-        except Exception:
-            self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:82.0) Gecko/20100101 Firefox/82.0"
-
-        self.headers = {
-            'Host': 'gmgn.ai',
-            'accept': 'application/json, text/plain, */*',
-            'accept-language': 'fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7',
-            'dnt': '1',
-            'priority': 'u=1, i',
-            'referer': 'https://gmgn.ai/?chain=sol',
-            'user-agent': self.user_agent
-        }
-
-    def loadProxies(self):
-        with open("Dragon/data/Proxies/proxies.txt", 'r') as file:
-            proxies = file.read().splitlines()
-
-        formatted_proxies = []
-        for proxy in proxies:
-            if ':' in proxy:  
-                parts = proxy.split(':')
-                if len(parts) == 4:
-                    ip, port, username, password = parts
-                    formatted_proxies.append({
-                        'http': f"http://{username}:{password}@{ip}:{port}",
-                        'https': f"http://{username}:{password}@{ip}:{port}"
-                    })
-                else:
-                    formatted_proxies.append({
-                        'http': f"http://{proxy}",
-                        'https': f"http://{proxy}"
-                    })
-            else:
-                formatted_proxies.append(f"http://{proxy}")        
-        return formatted_proxies
-    
-    def configureProxy(self, proxy):
-        if isinstance(proxy, dict): 
-            self.sendRequest.proxies = {
-                'http': proxy.get('http'),
-                'https': proxy.get('https')
-            }
-        elif isinstance(proxy, str):
-            self.sendRequest.proxies = {
-                'http': proxy,
-                'https': proxy
-            }
-        else:
-            self.sendRequest.proxies = None
-        return proxy
-    
-    def getNextProxy(self):
-        proxies = self.loadProxies()
-        proxy = proxies[self.proxyPosition % len(proxies)]
-        self.proxyPosition += 1
-        return proxy
 
+    def hasHistory(self, payload):
+        return isinstance(payload.get('data', {}).get('history'), list)
 
     def request(self, url: str, useProxies):
-        retries = 3
-        
-        for attempt in range(retries):
-            try:
-                proxy = self.getNextProxy() if useProxies else None
-                self.configureProxy(proxy)
-                response = self.sendRequest.get(url, headers=self.headers, allow_redirects=True)
-                if response.status_code == 200:
-                    data = response.json()['data']['history']
-                    paginator = response.json()['data'].get('next')
-                    return data, paginator
-            except Exception:
-                print(f"[🐲] Error fetching data, trying backup...")
-            
-            time.sleep(1)
-
-        print(f"[🐲] Failed to fetch data after {retries} attempts for URL: {url}")
-        return [], None
-
-    def getAllTxMakers(self, contractAddress: str, threads: int, useProxies):
+        try:
+            data = transport.getJson(url, proxy=proxyRegistry.next if useProxies else None, accept=self.hasHistory)['data']
+        except Exception as e:
+            print(f"[🐲] Failed to fetch data for URL {url}: {e}")
+            return [], None
+        return data['history'], data.get('next')
+
+    def addBuyMakers(self, history, allMakers):
+        with self.lock:
+            for maker in history:
+                event = maker['event']
+                if event == "buy":
+                    print(f"[🐲] Wallet: {maker['maker']} | Hash: {maker['tx_hash']} | Type: {event}")
+                    allMakers.add(maker['maker'])
+
+    def getAllTxMakers(self, contractAddress: str, threads: int, useProxies, useStore=False):
         base_url = f"http://172.86.110.62:1337/defi/quotation/v1/trades/eth/{contractAddress}?limit=100"
-        paginator = None
-        urls = []
-        
+        all_makers = set()
+
         print(f"[🐲] Starting... please wait.\n")
-            
-        while True:
-            self.randomise()
-            url = f"{base_url}&cursor={paginator}" if paginator else base_url
-            urls.append(url)
-            try:
-                proxy = self.getNextProxy() if useProxies else None
-                self.configureProxy(proxy)
-                response = self.sendRequest.get(url, headers=self.headers, allow_redirects=True)
-                if response.status_code != 200:
-                    raise Exception("Error in initial request")
-            except Exception:
-                print(f"[🐲] Error fetching data, trying backup..")
-            time.sleep(1)
-            
-            paginator = response.json()['data'].get('next')
 
-            if paginator:
-                print(f"[🐲] Page: {base64.b64decode(paginator).decode('utf-8')}")
-            else:
-                print("[🐲] Could not find page.")
-                break
+        if useStore:
+            pages = tradeStore.sync("eth", contractAddress, base_url, lambda url: self.request(url, useProxies), threads)
+            print(f"[🐲] Synced {pages} pages into the local trade store.")
+            all_makers.update(tradeStore.makers("eth", contractAddress, event="buy"))
+        else:
+            for history, paginator in pagination.iterPagesParallel(base_url, lambda url: self.request(url, useProxies), threads):
+                self.addBuyMakers(history, all_makers)
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
-            future_to_url = {executor.submit(self.request, url, useProxies): url for url in urls}
-            all_makers = set()
+                if paginator:
+                    print(f"[🐲] Page: {pagination.decodeCursor(paginator)}")
+                else:
+                    print("[🐲] Could not find page.")
 
-            for future in concurrent.futures.as_completed(future_to_url):
-                history, _ = future.result()
-                with self.lock: 
-                    for maker in history:
-                        event = maker['event']
-                        if event == "buy":
-                            print(f"[🐲] Wallet: {maker['maker']} | Hash: {maker['tx_hash']} | Type: {event}")
-                            all_makers.add(maker['maker'])
-        
         filename = f"wallets_{self.shorten(contractAddress)}__{random.randint(1111, 9999)}.txt"
         
         with open(f"Dragon/data/Ethereum/ScanAllTx/{filename}", "w") as file:
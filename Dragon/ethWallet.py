@@ -1,220 +1,65 @@
 import csv
 import random
-import tls_client
 
-from fake_useragent import UserAgent
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import time
+from Dragon import engine, transport
+from Dragon.metrics import formatEvmResults, profitDistribution
+from Dragon.proxies import proxyRegistry
+from Dragon.retry import walletPolicy
 
-ua = UserAgent(os='linux', browsers=['firefox'])
 
 class EthBulkWalletChecker:
 
     def __init__(self):
-        self.sendRequest = tls_client.Session(client_identifier='chrome_103')
-        
         self.shorten = lambda s: f"{s[:4]}...{s[-5:]}" if len(s) >= 9 else s
         self.skippedWallets = 0
-        self.proxyPosition = 0
         self.totalGrabbed = 0
         self.totalFailed = 0
         self.results = []
 
-    def randomise(self):
-        self.identifier = random.choice(
-            [browser for browser in tls_client.settings.ClientIdentifiers.__args__
-             if browser.startswith(('chrome', 'safari', 'firefox', 'opera'))]
-        )
-        parts = self.identifier.split('_')
-        identifier, version, *rest = parts
-        identifier = identifier.capitalize()
-        
-        self.sendRequest = tls_client.Session(random_tls_extension_order=True, client_identifier=self.identifier)
-        self.sendRequest.timeout_seconds = 60
-
-        if identifier == 'Opera':
-            identifier = 'Chrome'
-            osType = 'Windows'
-        elif version.lower() == 'ios':
-            osType = 'iOS'
-        else:
-            osType = 'Windows'
-
-        try:
-            self.user_agent = UserAgent(os=[osType]).random
-        except Exception:
-            self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:82.0) Gecko/20100101 Firefox/82.0"
-
-        self.headers = {
-            'Host': 'gmgn.ai',
-            'accept': 'application/json, text/plain, */*',
-            'accept-language': 'fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7',
-            'dnt': '1',
-            'priority': 'u=1, i',
-            'referer': 'https://gmgn.ai/?chain=sol',
-            'user-agent': self.user_agent
-        }
-
-    def loadProxies(self):
-        with open("Dragon/data/Proxies/proxies.txt", 'r') as file:
-            proxies = file.read().splitlines()
-
-        formatted_proxies = []
-        for proxy in proxies:
-            if ':' in proxy:  
-                parts = proxy.split(':')
-                if len(parts) == 4:
-                    ip, port, username, password = parts
-                    formatted_proxies.append({
-                        'http': f"http://{username}:{password}@{ip}:{port}",
-                        'https': f"http://{username}:{password}@{ip}:{port}"
-                    })
-                else:
-                    formatted_proxies.append({
-                        'http': f"http://{proxy}",
-                        'https': f"http://{proxy}"
-                    })
-            else:
-                formatted_proxies.append(f"http://{proxy}")        
-        return formatted_proxies
-    
-    def configureProxy(self, proxy):
-        if isinstance(proxy, dict): 
-            self.sendRequest.proxies = {
-                'http': proxy.get('http'),
-                'https': proxy.get('https')
-            }
-        elif isinstance(proxy, str):
-            self.sendRequest.proxies = {
-                'http': proxy,
-                'https': proxy
-            }
-        else:
-            self.sendRequest.proxies = None
-        return proxy
-    
-    def getNextProxy(self):
-        proxies = self.loadProxies()
-        proxy = proxies[self.proxyPosition % len(proxies)]
-        self.proxyPosition += 1
-        return proxy
-
-    
     def getTokenDistro(self, wallet: str, useProxies):
         url = f"http://172.86.110.62:1337/defi/quotation/v1/rank/eth/wallets/{wallet}/unique_token_7d?interval=30d"
-        retries = 3
-        tokenDistro = []
-
-        for attempt in range(retries):
-            self.randomise()
-            try:
-                proxy = self.getNextProxy() if useProxies else None
-                self.configureProxy(proxy)
-                response = self.sendRequest.get(url, headers=self.headers, allow_redirects=True).json()
-                tokenDistro = response['data']['tokens']
-                if tokenDistro:  
-                    break
-            except Exception:
-                time.sleep(1)
+        try:
+            tokenDistro = transport.getJson(url, proxy=proxyRegistry.next if useProxies else None, accept=lambda payload: payload.get('data', {}).get('tokens'))['data']['tokens']
+        except Exception:
+            tokenDistro = []
         
-        if not tokenDistro:
-            return {
-                "No Token Distribution Data": None
-            }
-
-        FiftyPercentOrMore = 0
-        ZeroToFifty = 0
-        FiftyTo100 = 0
-        TwoToFour = 0
-        FiveToSix = 0
-        SixPlus = 0
-        NegativeToFifty = 0 
-
-        for profit in tokenDistro:
-            total_profit_pnl = profit.get('total_profit_pnl')
-            if total_profit_pnl is not None:
-                profitMultiplier = total_profit_pnl * 100
-
-                if profitMultiplier <= -50:
-                    FiftyPercentOrMore += 1
-                elif -50 < profitMultiplier < 0:
-                    NegativeToFifty += 1
-                elif 0 <= profitMultiplier < 50:
-                    ZeroToFifty += 1
-                elif 50 <= profitMultiplier < 199:
-                    FiftyTo100 += 1
-                elif 200 <= profitMultiplier < 499:
-                    TwoToFour += 1
-                elif 500 <= profitMultiplier < 600:
-                    FiveToSix += 1
-                elif profitMultiplier >= 600:
-                    SixPlus += 1
-
-        return {
-            "-50% +": FiftyPercentOrMore,
-            "0% - -50%": NegativeToFifty,
-            "0 - 50%": ZeroToFifty,
-            "50% - 199%": FiftyTo100,
-            "200% - 499%": TwoToFour,
-            "500% - 600%": FiveToSix,
-            "600% +": SixPlus
-        }
+        return profitDistribution(tokenDistro)
 
     def getWalletData(self, wallet: str, skipWallets: bool, useProxies):
         url = f"http://172.86.110.62:1337/defi/quotation/v1/smartmoney/eth/walletNew/{wallet}?period=7d"
-        retries = 5
-        
-        for attempt in range(retries):
-            try:
-                self.randomise()
-                proxy = self.getNextProxy() if useProxies else None
-                self.configureProxy(proxy)
-                response = self.sendRequest.get(url, headers=self.headers)
-                if response.status_code == 200:
-                    data = response.json()
-                    if data['msg'] == "success":
-                        data = data['data']
-                        
-                        if skipWallets:
-                            if 'buy_30d' in data and isinstance(data['buy_30d'], (int, float)) and data['buy_30d'] > 0:
-                                self.totalGrabbed += 1
-                                print(f"[🐲] Successfully grabbed data for {wallet} ({self.totalGrabbed})")#  and float(data['eth_balance']) >= 1.0: (uncomment this to filter out insiders that cashed out already)
-                                return self.processWalletData(wallet, data, self.headers, useProxies)
-                            else:
-                                self.skippedWallets += 1
-                                print(f"[🐲] Skipped {self.skippedWallets} wallets", end="\r")
-                                return None
-                        else:
-                            return self.processWalletData(wallet, data, self.headers, useProxies)
-            except Exception as e:
-                self.totalFailed += 1
-                print(f"[🐲] Failed to grab data for {wallet} ({self.totalFailed})")
 
-            time.sleep(1)
-        
-        if "realized_profit" not in response.text:
-            print(f"[🐲] Failed to grab data for {wallet} after {retries} attempts.")
-        else:
-            print(f"[🐲] Successfully grabbed data for {wallet}")
-        return None
+        try:
+            data = transport.getJson(url, proxy=proxyRegistry.next if useProxies else None, policy=walletPolicy, accept=lambda payload: payload.get('msg') == "success")['data']
+
+            if skipWallets:
+                if 'buy_30d' in data and isinstance(data['buy_30d'], (int, float)) and data['buy_30d'] > 0:
+                    self.totalGrabbed += 1
+                    print(f"[🐲] Successfully grabbed data for {wallet} ({self.totalGrabbed})")#  and float(data['eth_balance']) >= 1.0: (uncomment this to filter out insiders that cashed out already)
+                    return self.processWalletData(wallet, data, useProxies)
+                else:
+                    self.skippedWallets += 1
+                    print(f"[🐲] Skipped {self.skippedWallets} wallets", end="\r")
+                    return None
+            return self.processWalletData(wallet, data, useProxies)
+        except Exception as e:
+            self.totalFailed += 1
+            print(f"[🐲] Failed to grab data for {wallet} ({self.totalFailed}): {e}")
+            return None
 
     
-    def processWalletData(self, wallet, data, headers, useProxies):
+    def processWalletData(self, wallet, data, useProxies):
         direct_link = f"http://172.86.110.62:1337/eth/address/{wallet}"
-        total_profit_percent = f"{data['total_profit_pnl'] * 100:.2f}%" if data['total_profit_pnl'] is not None else "error"
-        realized_profit_7d_usd = f"${data['realized_profit_7d']:,.2f}" if data['realized_profit_7d'] is not None else "error"
-        realized_profit_30d_usd = f"${data['realized_profit_30d']:,.2f}" if data['realized_profit_30d'] is not None else "error"
-        winrate_7d = f"{data['winrate'] * 100:.2f}%" if data['winrate'] is not None else "?"
-        eth_balance = f"{float(data['eth_balance']):.2f}" if data['eth_balance'] is not None else "?"
         buy_7d = f"{data['buy_7d']}" if data['buy_7d'] is not None else "?"
 
-        self.randomise()
-        winrate_30data = self.sendRequest.get(
-            f"http://172.86.110.62:1337/defi/quotation/v1/smartmoney/eth/walletNew/{wallet}?period=30d", 
-            headers=self.headers,
-            allow_redirects=True
-        ).json()['data']
-        winrate_30d = f"{winrate_30data['winrate'] * 100:.2f}%" if winrate_30data['winrate'] is not None else "?"
+        try:
+            winrate_30data = transport.getJson(
+                f"http://172.86.110.62:1337/defi/quotation/v1/smartmoney/eth/walletNew/{wallet}?period=30d",
+                proxy=proxyRegistry.next if useProxies else None,
+                accept=lambda payload: payload.get('data')
+            )['data']
+            winrate_30d = winrate_30data.get('winrate')
+        except Exception:
+            winrate_30d = None
 
         #try:
         #    total_profit_percent_value = float(data['total_profit_pnl']) * 100 if data['total_profit_pnl'] is not None else 0
@@ -240,25 +85,26 @@ class EthBulkWalletChecker:
 
         return {
             "wallet": wallet,
-            "totalProfitPercent": total_profit_percent,
-            "7dUSDProfit": realized_profit_7d_usd,
-            "30dUSDProfit": realized_profit_30d_usd,
-            "winrate_7d": winrate_7d,
+            "totalProfitPercent": data.get('total_profit_pnl'),
+            "7dUSDProfit": data.get('realized_profit_7d'),
+            "30dUSDProfit": data.get('realized_profit_30d'),
+            "winrate_7d": data.get('winrate'),
             "winrate_30d": winrate_30d,
             "tags": tags,
-            "eth_balance": eth_balance,
+            "eth_balance": data.get('eth_balance'),
             "token_distribution": tokenDistro if tokenDistro else {},
             "directLink": direct_link,
             "buy_7d": buy_7d
         }
     
     def fetchWalletData(self, wallets, threads, skipWallets, useProxies):
-        with ThreadPoolExecutor(max_workers=threads) as executor:
-            futures = {executor.submit(self.getWalletData, wallet.strip(), skipWallets, useProxies): wallet for wallet in wallets}
-            for future in as_completed(futures):
-                result = future.result()
-                if result is not None:
-                    self.results.append(result)
+        def collect(wallet, result):
+            if result is not None:
+                self.results.append(result)
+
+        engine.runThreads(lambda wallet: self.getWalletData(wallet.strip(), skipWallets, useProxies), wallets, threads, collect)
+
+        formatEvmResults(self.results, "eth_balance")
 
         result_dict = {}
         for result in self.results:
@@ -0,0 +1,182 @@
+import os
+import re
+import ast
+
+from typing import Any, Dict, List, Mapping, Tuple
+from Dragon import metrics
+
+filtersPath = os.path.join("Dragon", "data", "filters.txt")
+
+# Used when the filters file is missing; the same rules the file ships with.
+defaultRules = """
+[checker]
+`USDProfit` >= 0.001
+`Fast tx %` <= 30
+`No buy hold ratio` <= 30
+`SOL balance` > 0
+`Traded` >= 70
+
+[extractor]
+`Koefficient` > 0.5
+`Single buy` < 160
+
+[telegram]
+traded >= 100
+winrate > 35
+pnl * 10 >= traded * single_buy
+pnl <= traded * single_buy
+missing(first_profit) or first_profit <= 0.5 * pnl
+"""
+
+allowedNodes = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Compare, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+    ast.Eq, ast.NotEq, ast.Name, ast.Load, ast.Constant, ast.Call,
+)
+
+
+class Vectorize(ast.NodeTransformer):
+    # Rewrites a rule so it runs on whole columns: and/or/not become &, |, ~,
+    # chained comparisons are split, division is NaN-aware and every column
+    # name is replaced by a placeholder the evaluator binds.
+
+    def __init__(self, names: List[str]):
+        self.names = names
+
+    def visit_Name(self, node):
+        if node.id not in self.names:
+            self.names.append(node.id)
+        return ast.Name(id=f"_{self.names.index(node.id)}", ctx=ast.Load())
+
+    def visit_Call(self, node):
+        # missing(x): the only call, and not a column itself.
+        return ast.Call(func=ast.Name(id="missing", ctx=ast.Load()), args=[self.visit(node.args[0])], keywords=[])
+
+    def visit_BoolOp(self, node):
+        operator = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        values = [self.visit(value) for value in node.values]
+        result = values[0]
+        for value in values[1:]:
+            result = ast.BinOp(left=result, op=operator, right=value)
+        return result
+
+    def visit_UnaryOp(self, node):
+        operand = self.visit(node.operand)
+        return ast.UnaryOp(op=ast.Invert() if isinstance(node.op, ast.Not) else node.op, operand=operand)
+
+    def visit_BinOp(self, node):
+        left, right = self.visit(node.left), self.visit(node.right)
+        if isinstance(node.op, ast.Div):
+            return ast.Call(func=ast.Name(id="divide", ctx=ast.Load()), args=[left, right], keywords=[])
+        return ast.BinOp(left=left, op=node.op, right=right)
+
+    def visit_Compare(self, node):
+        operands = [self.visit(node.left)] + [self.visit(comparator) for comparator in node.comparators]
+        parts = [ast.Compare(left=operands[index], ops=[op], comparators=[operands[index + 1]]) for index, op in enumerate(node.ops)]
+        result = parts[0]
+        for part in parts[1:]:
+            result = ast.BinOp(left=result, op=ast.BitAnd(), right=part)
+        return result
+
+
+class Rule:
+    # One compiled rule. A comparison involving a missing value is false, so
+    # a rule on a missing value fails unless it allows it with missing(x).
+
+    def __init__(self, source: str):
+        self.source = source
+        # `Column name` refers to a column whose name is not an identifier.
+        quoted = re.findall(r"`([^`]+)`", source)
+        text = re.sub(r"`([^`]+)`", lambda match: f"__quoted{quoted.index(match.group(1))}", source)
+        try:
+            tree = ast.parse(text, mode='eval')
+        except SyntaxError:
+            raise ValueError(f"[🐲] Invalid filter rule: {source}")
+        for node in ast.walk(tree):
+            if not isinstance(node, allowedNodes):
+                raise ValueError(f"[🐲] Unsupported syntax in filter rule: {source}")
+            if isinstance(node, ast.Constant) and (isinstance(node.value, bool) or not isinstance(node.value, (int, float))):
+                raise ValueError(f"[🐲] Only numbers are allowed as constants in filter rule: {source}")
+            if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name) and node.func.id == "missing" and len(node.args) == 1 and not node.keywords):
+                raise ValueError(f"[🐲] The only function in filter rules is missing(column): {source}")
+        names: List[str] = []
+        vectorized = ast.fix_missing_locations(Vectorize(names).visit(tree))
+        self.names = [quoted[int(name[len("__quoted"):])] if name.startswith("__quoted") else name for name in names]
+        self.code = compile(vectorized, f"<filter {source}>", 'eval')
+
+    def evaluate(self, values: Mapping[str, Any]):
+        np = metrics.numpy()
+        unknown = [name for name in self.names if name not in values]
+        if unknown:
+            raise KeyError(f"[🐲] Filter rule '{self.source}' uses unknown column(s): {', '.join(unknown)}")
+        namespace = {f"_{index}": values[name] for index, name in enumerate(self.names)}
+        namespace.update(missing=np.isnan, divide=metrics.divide)
+        with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+            return eval(self.code, {"__builtins__": {}}, namespace)
+
+
+class WalletFilter:
+    # Every rule of one stage; a row passes when it passes them all.
+
+    def __init__(self, stage: str, rules: List[Rule]):
+        self.stage = stage
+        self.rules = rules
+
+    def apply(self, values: Mapping[str, Any], size: int) -> Tuple[Any, List[Tuple[Rule, Any]]]:
+        # Returns the pass mask and, per rule, the mask of rows it rejected.
+        np = metrics.numpy()
+        passed = np.ones(size, dtype=bool)
+        failures = []
+        for rule in self.rules:
+            rejected = ~np.broadcast_to(np.asarray(rule.evaluate(values), dtype=bool), (size,))
+            failures.append((rule, rejected))
+            passed &= ~rejected
+        return passed, failures
+
+    def summary(self) -> str:
+        return ", ".join(rule.source for rule in self.rules) or "no rules"
+
+    def report(self, failures: List[Tuple[Rule, Any]]) -> str:
+        return ", ".join(f"{rule.source}: {int(rejected.sum())}" for rule, rejected in failures if rejected.any())
+
+
+def parseFilters(text: str) -> Dict[str, WalletFilter]:
+    # [stage] headers, then one rule per line. '#' starts a comment.
+    stages: Dict[str, List[Rule]] = {}
+    stage = None
+    for line in text.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        if line.startswith('[') and line.endswith(']'):
+            stage = line[1:-1].strip().lower()
+            stages.setdefault(stage, [])
+        elif stage is None:
+            raise ValueError(f"[🐲] Filter rule outside of a [stage] section: {line}")
+        else:
+            stages[stage].append(Rule(line))
+    return {name: WalletFilter(name, rules) for name, rules in stages.items()}
+
+
+compiled: Dict[str, Dict[str, WalletFilter]] = {}
+
+
+def stageFilter(stage: str, path: str = filtersPath) -> WalletFilter:
+    # Rules are read and compiled once per file. A stage the file doesn't
+    # mention falls back to the default rules for it.
+    if path not in compiled:
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                compiled[path] = parseFilters(file.read())
+        except FileNotFoundError:
+            compiled[path] = parseFilters(defaultRules)
+    filters = compiled[path]
+    if stage not in filters:
+        filters[stage] = parseFilters(defaultRules).get(stage, WalletFilter(stage, []))
+    return filters[stage]
+
+
+def csvColumn(texts: List[Any]):
+    # CSV text as numbers: "20.00%", "$1,234.50" and "1,234.5" all parse, the
+    # sentinels ("error", "?") become missing.
+    return metrics.column([None if text is None else str(text).strip().replace('%', '').replace('$', '').replace(',', '') for text in texts])
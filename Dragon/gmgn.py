@@ -1,94 +1,21 @@
+import os
 import time
-import random
-import tls_client
-from fake_useragent import UserAgent
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from Dragon import transport
+from Dragon.proxies import proxyRegistry
+
+# Append-only list of every contract the watch mode has seen, one per line.
+# It is also the persisted seen-set: a restarted watch only reports tokens
+# that aren't in it yet.
+feedPath = os.path.join("Dragon", "data", "GMGN", "feed.txt")
+watchSites = ["Pump.Fun", "Moonshot"]
+watchIndicators = ["NewToken", "CompletingToken", "SoaringToken", "BondedToken"]
 
 class GMGN:
 
     def __init__(self):
         self.shorten = lambda s: f"{s[:4]}...{s[-5:]}" if len(s) >= 9 else s
-        self.proxyPosition = 0
-
-    def randomise(self):
-        self.identifier = random.choice(
-            [browser for browser in tls_client.settings.ClientIdentifiers.__args__
-             if browser.startswith(('chrome', 'safari', 'firefox', 'opera'))]
-        )
-        parts = self.identifier.split('_')
-        identifier, version, *rest = parts
-        identifier = identifier.capitalize()
-        
-        self.sendRequest = tls_client.Session(random_tls_extension_order=True, client_identifier=self.identifier)
-        self.sendRequest.timeout_seconds = 60
-
-        if identifier == 'Opera':
-            identifier = 'Chrome'
-            osType = 'Windows'
-        elif version.lower() == 'ios':
-            osType = 'iOS'
-        else:
-            osType = 'Windows'
 
-        try:
-            self.user_agent = UserAgent(os=[osType]).random
-        except Exception:
-            self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:82.0) Gecko/20100101 Firefox/82.0"
-
-        self.headers = {
-            'Host': 'gmgn.ai',
-            'accept': 'application/json, text/plain, */*',
-            'accept-language': 'fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7',
-            'dnt': '1',
-            'priority': 'u=1, i',
-            'referer': 'https://gmgn.ai/?chain=sol',
-            'user-agent': self.user_agent
-        }
-
-    def loadProxies(self):
-        with open("Dragon/data/Proxies/proxies.txt", 'r') as file:
-            proxies = file.read().splitlines()
-
-        formatted_proxies = []
-        for proxy in proxies:
-            if ':' in proxy:  
-                parts = proxy.split(':')
-                if len(parts) == 4:
-                    ip, port, username, password = parts
-                    formatted_proxies.append({
-                        'http': f"http://{username}:{password}@{ip}:{port}",
-                        'https': f"http://{username}:{password}@{ip}:{port}"
-                    })
-                else:
-                    formatted_proxies.append({
-                        'http': f"http://{proxy}",
-                        'https': f"http://{proxy}"
-                    })
-            else:
-                formatted_proxies.append(f"http://{proxy}")        
-        return formatted_proxies
-    
-    def configureProxy(self, proxy):
-        if isinstance(proxy, dict): 
-            self.sendRequest.proxies = {
-                'http': proxy.get('http'),
-                'https': proxy.get('https')
-            }
-        elif isinstance(proxy, str):
-            self.sendRequest.proxies = {
-                'http': proxy,
-                'https': proxy
-            }
-        else:
-            self.sendRequest.proxies = None
-        return proxy
-    
-    def getNextProxy(self):
-        proxies = self.loadProxies()
-        proxy = proxies[self.proxyPosition % len(proxies)]
-        self.proxyPosition += 1
-        return proxy
-    
     def newToken(self, siteChoice):
         if siteChoice == "Pump.Fun":
             url = "http://172.86.110.62:1337/defi/quotation/v1/rank/sol/pump/1h?limit=100&orderby=created_timestamp&direction=desc&new_creation=true"
@@ -118,8 +45,6 @@ class GMGN:
         return url
     
     def fetchContracts(self, urlIndicator, useProxies, siteChoice):
-        retries = 3
-
         contracts = set()
 
         if urlIndicator == "NewToken":
@@ -131,45 +56,77 @@ class GMGN:
         else:
             url = self.bondedToken(siteChoice)
 
-        for attempt in range(retries):
-            try:
-                self.randomise()
-                proxy = self.getNextProxy() if useProxies else None
-                self.configureProxy(proxy)
-                response = self.sendRequest.get(url, headers=self.headers, allow_redirects=True)
-                if response.status_code == 200:
-
-                    if urlIndicator == "BondedToken":
-                        data = response.json().get('data', {}).get('pairs', [])
-
-                        for item in data:
-                            if item.get('base_address') and item.get('base_address') != "":
-                                contract = item.get('base_address')
-                                contracts.add(contract)
-                    else:
-                        data = response.json().get('data', {}).get('rank', [])
-                        
-                        for item in data:
-                            if item.get('address') and item.get('address') != "":
-                                contract = item.get('address')
-                                contracts.add(contract)
-            except Exception as e:
-                print(f"[🐲] Error fetching data on attempt, trying backup... {e}")
-        time.sleep(1)
+        key = 'pairs' if urlIndicator == "BondedToken" else 'rank'
+        addressKey = 'base_address' if urlIndicator == "BondedToken" else 'address'
+
+        try:
+            data = transport.getJson(url, proxy=proxyRegistry.next if useProxies else None, accept=lambda payload: isinstance(payload.get('data', {}).get(key), list))
+        except Exception as e:
+            print(f"[🐲] Error fetching {urlIndicator} contracts: {e}")
+            return []
+
+        for item in data['data'][key]:
+            if item.get(addressKey):
+                contracts.add(item[addressKey])
 
         return list(contracts)
 
-    def contractsData(self, urlIndicator, threads, useProxies, siteChoice):
-        contract_addresses = set()
+    def contractsData(self, urlIndicator, useProxies, siteChoice):
+        # A ranking is one page; fetching it more than once only returns the same list.
+        contract_addresses = self.fetchContracts(urlIndicator, useProxies, siteChoice)
+        if not contract_addresses:
+            print(f"[🐲] No {urlIndicator} contracts found on {siteChoice}.")
+            return
 
-        with ThreadPoolExecutor(max_workers=threads) as executor:
-            futures = [executor.submit(self.fetchContracts, urlIndicator, useProxies, siteChoice) for _ in range(threads)]
-            for future in as_completed(futures):
-                contract_addresses.update(future.result())
-        
-        identifier = self.shorten(list(contract_addresses)[0])
+        identifier = self.shorten(contract_addresses[0])
 
         with open(f"Dragon/data/GMGN/{siteChoice}/{urlIndicator}/contracts_{identifier}.txt", "w") as file:
             for address in contract_addresses:
                 file.write(f"{address}\n")
         print(f"[🐲] {len(contract_addresses)} contract addresses have been written to Dragon/data/GMGN/{urlIndicator}/contracts_{identifier}.txt")
+
+    def siteContracts(self, siteChoice, useProxies):
+        # Every category of one site, one request each, yielded as they arrive.
+        for indicator in watchIndicators:
+            yield from self.fetchContracts(indicator, useProxies, siteChoice)
+
+    def loadSeen(self, path):
+        try:
+            with open(path, 'r') as file:
+                return {line.strip() for line in file if line.strip()}
+        except OSError:
+            return set()
+
+    def watch(self, interval: float, useProxies, path: str = feedPath, ticks=None):
+        # Polls every category on both sites once per tick (eight requests) and
+        # appends only contracts that have never been seen before. Runs until
+        # interrupted, or for `ticks` ticks.
+        seen = self.loadSeen(path)
+        targets = [(site, indicator) for site in watchSites for indicator in watchIndicators]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        print(f"[🐲] Watching {len(targets)} rankings every {interval:g}s, {len(seen)} contracts already seen. Ctrl+C to stop.")
+
+        tick = 0
+        found = 0
+        nextTick = time.monotonic()
+        try:
+            with open(path, 'a') as feed, ThreadPoolExecutor(max_workers=len(targets)) as executor:
+                while ticks is None or tick < ticks:
+                    futures = {executor.submit(self.fetchContracts, indicator, useProxies, site): (site, indicator) for site, indicator in targets}
+                    for future in as_completed(futures):
+                        site, indicator = futures[future]
+                        for address in future.result():
+                            if address in seen:
+                                continue
+                            seen.add(address)
+                            found += 1
+                            feed.write(f"{address}\n")
+                            print(f"[🐲] New {indicator} on {site}: {address}")
+                    feed.flush()
+
+                    tick += 1
+                    nextTick += interval
+                    time.sleep(max(0.0, nextTick - time.monotonic()))
+        except KeyboardInterrupt:
+            pass
+        print(f"[🐲] Stopped after {tick} ticks. {found} new contract addresses appended to {path}")
@@ -0,0 +1,255 @@
+from math import nan
+from operator import attrgetter
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Wallet CSV columns, after the leading 'Identifier'.
+columns = [
+    "PNL (*100%)", "Koefficient", "USDProfit", "Winrate", "Single buy", "Traded",
+    "Number of tokens traded", "Buys", "Sell",
+    "PnL < -0.5x %", "PnL -0.5x to 0x %", "PnL < 2x %", "PnL 2x to 5x %", "PnL > 5x %",
+    "Fast tx %", "No buy hold ratio", "SOL balance",
+]
+
+# Sentinels the CSV has always used for values the API didn't return.
+missingNumber = "-1.23"
+missingRatio = "110"
+missingPercent = "?"
+missingDerived = "error"
+
+
+def number(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("[🐲] Wallet metrics require numpy (pip install numpy).")
+    return numpy
+
+
+def column(values: Sequence[Any]):
+    # float64 column with NaN wherever a value is missing or not a number.
+    np = numpy()
+    try:
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.fromiter((nan if value is None else value for value in map(number, values)), dtype=np.float64, count=len(values))
+
+
+def divide(numerator, denominator):
+    # NaN wherever the denominator is zero or either side is missing.
+    np = numpy()
+    result = np.full(np.broadcast(numerator, denominator).shape, nan)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        np.divide(numerator, denominator, out=result, where=~np.isnan(numerator) & ~np.isnan(denominator) & (denominator != 0))
+    return result
+
+
+def rounded(values, digits: int):
+    # Python's round(), which is exact where np.round is not (0.005 -> 0.01),
+    # so the filters agree with the digits the CSV prints. np.round is only
+    # off near a half or past float precision, so only those go through round().
+    np = numpy()
+    with np.errstate(invalid='ignore', over='ignore'):
+        scaled = values * 10.0 ** digits
+        result = np.round(scaled) / 10.0 ** digits
+        fraction = np.abs(scaled - np.floor(scaled) - 0.5)
+        inexact = ~np.isnan(values) & ~((fraction > 2 * np.spacing(np.abs(scaled))) & (np.abs(scaled) < 2.0 ** 52))
+    for index in inexact.nonzero()[0].tolist():
+        result[index] = round(float(values[index]), digits)
+    return result
+
+
+def formatted(values, template: str, missing: str) -> List[str]:
+    return [missing if value != value else template.format(value) for value in values.tolist()]
+
+
+def ratioOf(risk: Any, key: str) -> Optional[float]:
+    return number(risk.get(key)) if isinstance(risk, dict) else None
+
+
+class WalletMetrics:
+    # One wallet's 7d stats as raw numbers, None where the API had nothing.
+    # Counters keep the type the API sent them as, since the CSV prints them
+    # as-is. Derived values and filters are computed for a whole batch of
+    # records at once by SolanaBatch.
+    __slots__ = (
+        "wallet", "skipped", "pnl7d", "realizedProfit7d", "winrate", "buy7d", "sell7d", "tokenNum",
+        "pnlLtMinusDot5Num", "pnlMinusDot5To0xNum", "pnlLt2xNum", "pnl2xTo5xNum", "pnlGt5xNum",
+        "solBalance", "fastTxRatio", "noBuyHoldRatio",
+    )
+
+    def __init__(self, wallet: str, data: Dict[str, Any]):
+        self.wallet = wallet
+        self.skipped = "Skipped" in (data.get("tags") or [])
+        self.pnl7d = number(data.get('pnl_7d'))
+        self.realizedProfit7d = number(data.get('realized_profit_7d'))
+        self.winrate = number(data.get('winrate'))
+        self.buy7d = data.get('buy_7d')
+        self.sell7d = data.get('sell_7d')
+        self.tokenNum = data.get('token_num')
+        self.pnlLtMinusDot5Num = data.get('pnl_lt_minus_dot5_num')
+        self.pnlMinusDot5To0xNum = data.get('pnl_minus_dot5_0x_num')
+        self.pnlLt2xNum = data.get('pnl_lt_2x_num')
+        self.pnl2xTo5xNum = data.get('pnl_2x_5x_num')
+        self.pnlGt5xNum = data.get('pnl_gt_5x_num')
+        self.solBalance = data.get('sol_balance')
+        self.fastTxRatio = ratioOf(data.get('risk'), 'fast_tx_ratio')
+        self.noBuyHoldRatio = ratioOf(data.get('risk'), 'no_buy_hold_ratio')
+
+
+def rawSum(first: Any, second: Any) -> Any:
+    try:
+        return first + second if first is not None and second is not None else None
+    except TypeError:
+        return None
+
+
+def rawText(value: Any, missing: str) -> str:
+    return missing if value is None else f"{value}"
+
+
+class SolanaBatch:
+    # Every derived column for a list of WalletMetrics, computed as whole
+    # columns, and the checker's filter applied to them. Single buy and
+    # koefficient are still computed from the rounded values the CSV shows,
+    # as they always have been.
+
+    def __init__(self, records: List[WalletMetrics], walletFilter):
+        np = numpy()
+        self.records = records
+        field = lambda name: column(list(map(attrgetter(name), records)))
+
+        self.pnl = field("pnl7d")
+        self.realizedProfit = field("realizedProfit7d")
+        self.winrate = field("winrate")
+        buys, sells, tokenNum = field("buy7d"), field("sell7d"), field("tokenNum")
+        self.traded = buys + sells
+        self.fastTx = field("fastTxRatio") * 100
+        self.noBuyHold = field("noBuyHoldRatio") * 100
+
+        with np.errstate(invalid='ignore', over='ignore'):
+            self.singleBuy = rounded(divide(self.realizedProfit, self.pnl * buys), 4)
+            self.koefficient = divide(rounded(self.realizedProfit, 2), self.singleBuy * self.traded / 10.0)
+            self.buckets = [divide(field(name), tokenNum) * 100 for name in
+                            ("pnlLtMinusDot5Num", "pnlMinusDot5To0xNum", "pnlLt2xNum", "pnl2xTo5xNum", "pnlGt5xNum")]
+
+        # A missing balance reads as 0; an unreadable one has always let the
+        # wallet through.
+        balances = ["0" if record.solBalance is None else str(record.solBalance).replace(',', '') for record in records]
+        try:
+            solBalance, unreadable = np.array(balances, dtype=np.float64), np.zeros(len(records), dtype=bool)
+        except ValueError:
+            solBalance, unreadable = column(balances), np.array([number(balance) is None for balance in balances], dtype=bool)
+        self.skipped = np.array([record.skipped for record in records], dtype=bool)
+
+        # Filters see every column at the precision the CSV prints, so a
+        # written row never contradicts the filter that let it through.
+        with np.errstate(invalid='ignore', over='ignore'):
+            self.values = {
+                "PNL (*100%)": rounded(self.pnl, 2),
+                "Koefficient": rounded(self.koefficient, 2),
+                "USDProfit": rounded(self.realizedProfit, 2),
+                "Winrate": rounded(self.winrate * 100, 2),
+                "Single buy": self.singleBuy,
+                "Traded": self.traded,
+                "Number of tokens traded": tokenNum,
+                "Buys": buys,
+                "Sell": sells,
+                **{name: rounded(values, 2) for name, values in zip(columns[9:14], self.buckets)},
+                "Fast tx %": rounded(self.fastTx, 2),
+                "No buy hold ratio": rounded(self.noBuyHold, 2),
+                "SOL balance": solBalance,
+            }
+        passed, failures = walletFilter.apply(self.values, len(records))
+        self.passed = (passed | unreadable) & ~self.skipped
+        # What each rule rejected among the wallets that were filtered out.
+        self.failures = [(rule, rejected & ~self.passed & ~self.skipped) for rule, rejected in failures]
+
+    def table(self, mask) -> Dict[str, List[str]]:
+        # CSV text for the selected records, column by column.
+        records = [record for record, selected in zip(self.records, mask.tolist()) if selected]
+        pick = lambda values: values[mask]
+        buckets = [formatted(pick(values), "{:.2f}%", missingPercent) for values in self.buckets]
+        return {
+            "PNL (*100%)": formatted(pick(self.pnl), "{:,.2f}", missingNumber),
+            "Koefficient": formatted(pick(self.koefficient), "{:.2f}", missingDerived),
+            "USDProfit": formatted(pick(self.realizedProfit), "{:.2f}", missingNumber),
+            "Winrate": formatted(pick(self.winrate) * 100, "{:.2f}%", missingNumber),
+            "Single buy": formatted(pick(self.singleBuy), "{:.4f}", missingDerived),
+            "Traded": [rawText(rawSum(record.buy7d, record.sell7d), missingNumber) for record in records],
+            "Number of tokens traded": [rawText(record.tokenNum, missingNumber) for record in records],
+            "Buys": [rawText(record.buy7d, missingNumber) for record in records],
+            "Sell": [rawText(record.sell7d, missingNumber) for record in records],
+            "PnL < -0.5x %": buckets[0],
+            "PnL -0.5x to 0x %": buckets[1],
+            "PnL < 2x %": buckets[2],
+            "PnL 2x to 5x %": buckets[3],
+            "PnL > 5x %": buckets[4],
+            "Fast tx %": formatted(pick(self.fastTx), "{:.2f}%", missingRatio),
+            "No buy hold ratio": formatted(pick(self.noBuyHold), "{:.2f}%", missingRatio),
+            "SOL balance": [rawText(record.solBalance, "0") for record in records],
+        }
+
+    def rows(self) -> Iterator[Tuple[str, List[str]]]:
+        table = self.table(self.passed)
+        wallets = [record.wallet for record, passed in zip(self.records, self.passed.tolist()) if passed]
+        return zip(wallets, (list(row) for row in zip(*(table[name] for name in columns))))
+
+    def failedCriteria(self) -> Iterator[Tuple[str, List[str]]]:
+        mask = ~self.passed
+        table = self.table(mask)
+        for position, index in enumerate(mask.nonzero()[0].tolist()):
+            if self.skipped[index]:
+                yield self.records[index].wallet, ["tagged Skipped"]
+                continue
+            yield self.records[index].wallet, [
+                f"{rule.source} ({', '.join(f'{name} {table[name][position]}' for name in rule.names if name in table)})"
+                for rule, rejected in self.failures if rejected[index]
+            ]
+
+
+# ETH/BSC token distribution buckets by total profit %. The gaps between
+# 199-200% and 499-500% have never been counted.
+distributionBuckets = ["-50% +", "0% - -50%", "0 - 50%", "50% - 199%", "200% - 499%", "500% - 600%", "600% +"]
+
+# ETH/BSC columns kept as raw numbers until the CSV is written:
+# key -> (template, text when missing, scale).
+evmFields = {
+    "totalProfitPercent": ("{:.2f}%", missingDerived, 100),
+    "7dUSDProfit": ("${:,.2f}", missingDerived, 1),
+    "30dUSDProfit": ("${:,.2f}", missingDerived, 1),
+    "winrate_7d": ("{:.2f}%", missingPercent, 100),
+    "winrate_30d": ("{:.2f}%", missingPercent, 100),
+}
+
+
+def profitDistribution(tokens: List[Dict[str, Any]]) -> Dict[str, Any]:
+    if not tokens:
+        return {"No Token Distribution Data": None}
+    np = numpy()
+    profit = column([token.get('total_profit_pnl') for token in tokens]) * 100
+    with np.errstate(invalid='ignore'):
+        masks = [
+            profit <= -50, (-50 < profit) & (profit < 0), (0 <= profit) & (profit < 50), (50 <= profit) & (profit < 199),
+            (200 <= profit) & (profit < 499), (500 <= profit) & (profit < 600), profit >= 600,
+        ]
+    return {name: int(mask.sum()) for name, mask in zip(distributionBuckets, masks)}
+
+
+def formatEvmResults(results: List[Dict[str, Any]], balanceKey: str) -> None:
+    # Replaces the raw numbers of every ETH/BSC result with their CSV text, a
+    # column at a time. Skipped wallets carry no numbers and are left alone.
+    rows = [result for result in results if balanceKey in result]
+    fields = dict(evmFields, **{balanceKey: ("{:.2f}", missingPercent, 1)})
+    for key, (template, missing, scale) in fields.items():
+        texts = formatted(column([row[key] for row in rows]) * scale, template, missing)
+        for row, text in zip(rows, texts):
+            row[key] = text
@@ -0,0 +1,201 @@
+import re
+import base64
+import binascii
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+Page = Tuple[List[Any], Optional[str]]
+
+# Upper bound on pages fetched per wave; it is also how far a wave can
+# overshoot the end of the history.
+maxWave = 100
+
+
+def pageUrl(baseUrl: str, cursor: Optional[str]) -> str:
+    return f"{baseUrl}&cursor={cursor}" if cursor else baseUrl
+
+
+def iterPages(baseUrl: str, fetchPage: Callable[[str], Page], prefetch: bool = True, cursor: Optional[str] = None) -> Iterator[Page]:
+    # Walks a cursor chain once, yielding (history, nextCursor) per page in order.
+    # fetchPage(url) returns ([], None) when it gives up, which ends the walk.
+    # With prefetch the next page is already downloading while the caller
+    # processes the current one, so fetching and processing overlap.
+    if not prefetch:
+        while True:
+            history, cursor = fetchPage(pageUrl(baseUrl, cursor))
+            yield history, cursor
+            if not cursor:
+                return
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(fetchPage, pageUrl(baseUrl, cursor))
+        while future is not None:
+            history, cursor = future.result()
+            future = executor.submit(fetchPage, pageUrl(baseUrl, cursor)) if cursor else None
+            yield history, cursor
+
+
+def decodeCursor(cursor: str) -> Optional[str]:
+    try:
+        return base64.b64decode(cursor + "=" * (-len(cursor) % 4), altchars=b"-_" if "-" in cursor or "_" in cursor else None, validate=True).decode('utf-8')
+    except (binascii.Error, ValueError):
+        return None
+
+
+def cursorSynthesizer(first: str, second: str) -> Optional[Callable[[int], Optional[str]]]:
+    # The cursors for pages 1 and 2 decode to text; if they differ in exactly
+    # one integer field, assume that field is a position advancing by a fixed
+    # stride and return cursorFor(page). It must reproduce both real cursors
+    # byte for byte, otherwise the format isn't one we understand.
+    decodedFirst, decodedSecond = decodeCursor(first), decodeCursor(second)
+    if decodedFirst is None or decodedSecond is None:
+        return None
+
+    partsFirst, partsSecond = re.split(r"(\d+)", decodedFirst), re.split(r"(\d+)", decodedSecond)
+    if len(partsFirst) != len(partsSecond):
+        return None
+
+    changed = [index for index, (a, b) in enumerate(zip(partsFirst, partsSecond)) if a != b]
+    if len(changed) != 1 or changed[0] % 2 == 0:
+        return None
+
+    field = changed[0]
+    start = int(partsFirst[field])
+    stride = int(partsSecond[field]) - start
+    width = len(partsFirst[field]) if partsFirst[field].startswith("0") else 0
+    urlSafe = "-" in first + second or "_" in first + second
+    padded = first.endswith("=") or second.endswith("=")
+
+    def cursorFor(page: int) -> Optional[str]:
+        value = start + (page - 1) * stride
+        if value < 0:
+            return None
+        parts = list(partsFirst)
+        parts[field] = str(value).zfill(width)
+        raw = "".join(parts).encode('utf-8')
+        encoded = (base64.urlsafe_b64encode(raw) if urlSafe else base64.b64encode(raw)).decode('ascii')
+        return encoded if padded else encoded.rstrip("=")
+
+    if cursorFor(1) != first or cursorFor(2) != second:
+        return None
+    return cursorFor
+
+
+def skipUntil(pages: Iterator[Page], reached: Optional[Callable[[List[Any]], bool]]) -> Iterator[Page]:
+    for history, cursor in pages:
+        if reached is None or reached(history) or not cursor:
+            reached = None
+            yield history, cursor
+
+
+def gallop(baseUrl: str, fetchPage: Callable[[str], Page], cursorFor: Callable[[int], Optional[str]],
+           reached: Callable[[List[Any]], bool], lo: int) -> Optional[int]:
+    # Page `lo` is known not to satisfy reached(); find the first page that does
+    # by doubling the step, then bisecting. Each probe must agree with the
+    # synthesised chain, otherwise None is returned and the caller walks serially.
+    def probe(page: int) -> Optional[bool]:
+        cursor = cursorFor(page)
+        if cursor is None:
+            return True
+        history, nextCursor = fetchPage(pageUrl(baseUrl, cursor))
+        if nextCursor and nextCursor != cursorFor(page + 1):
+            return None
+        return reached(history) or not nextCursor
+
+    step, hi = 1, None
+    while hi is None:
+        result = probe(lo + step)
+        if result is None:
+            return None
+        if result:
+            hi = lo + step
+        else:
+            lo, step = lo + step, step * 2
+
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        result = probe(mid)
+        if result is None:
+            return None
+        if result:
+            hi = mid
+        else:
+            lo = mid
+    return hi
+
+
+def walkWaves(baseUrl: str, fetchPage: Callable[[str], Page], cursorFor: Callable[[int], Optional[str]], page: int, concurrency: int) -> Iterator[Page]:
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        lastCursor = cursorFor(page)
+        while True:
+            cursors = []
+            for offset in range(concurrency):
+                cursor = cursorFor(page + offset)
+                if cursor is None:
+                    break
+                cursors.append(cursor)
+            if not cursors:
+                yield from iterPages(baseUrl, fetchPage, cursor=lastCursor)
+                return
+
+            futures = [executor.submit(fetchPage, pageUrl(baseUrl, cursor)) for cursor in cursors]
+            for offset, future in enumerate(futures):
+                history, cursor = future.result()
+                yield history, cursor
+                if not cursor:
+                    return
+                if cursor != cursorFor(page + offset + 1):
+                    print("[🐲] Cursor chain diverged from the synthesised one, continuing serially.")
+                    for pending in futures[offset + 1:]:
+                        pending.cancel()
+                    yield from iterPages(baseUrl, fetchPage, cursor=cursor)
+                    return
+                lastCursor = cursor
+            page += len(cursors)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iterPagesParallel(baseUrl: str, fetchPage: Callable[[str], Page], concurrency: int,
+                      reached: Optional[Callable[[List[Any]], bool]] = None) -> Iterator[Page]:
+    # Same contract as iterPages, but once the cursor format is recognised the
+    # rest of the history is fetched in waves of `concurrency` synthesised
+    # cursors. Every page's real `next` is checked against the synthesised one;
+    # on any mismatch it falls back to the serial walk from the real cursor.
+    # With `reached` (monotonic along the chain), leading pages for which it is
+    # false are skipped, by galloping over them when the cursor allows it.
+    concurrency = min(concurrency, maxWave)
+    if concurrency <= 1:
+        yield from skipUntil(iterPages(baseUrl, fetchPage), reached)
+        return
+
+    history, first = fetchPage(pageUrl(baseUrl, None))
+    if not first:
+        yield history, first
+        return
+
+    leading = [(history, first)]
+    history, second = fetchPage(pageUrl(baseUrl, first))
+    leading.append((history, second))
+    yield from skipUntil(iter(leading), reached)
+    if not second:
+        return
+
+    cursorFor = cursorSynthesizer(first, second)
+    if cursorFor is None:
+        print("[🐲] Cursor format not recognised, paging serially.")
+        pages = iterPages(baseUrl, fetchPage, cursor=second)
+        yield from pages if reached is None or reached(history) else skipUntil(pages, reached)
+        return
+
+    print(f"[🐲] Cursor format recognised, fetching {concurrency} pages at a time.")
+    page = 2
+    if reached is not None and not reached(history):
+        page = gallop(baseUrl, fetchPage, cursorFor, reached, 1)
+        if page is None:
+            print("[🐲] Cursor chain diverged from the synthesised one, continuing serially.")
+            yield from skipUntil(iterPages(baseUrl, fetchPage, cursor=second), reached)
+            return
+    yield from walkWaves(baseUrl, fetchPage, cursorFor, page, concurrency)
@@ -0,0 +1,147 @@
+import queue
+import threading
+
+from typing import Any, Callable, Iterable, List
+from Dragon import engine
+from Dragon.retry import BudgetExceeded, runBudget
+from Dragon.traders import TopTraders
+from Dragon.holders import TopHolders
+from Dragon.earlyBuyers import EarlyBuyers
+from Dragon.wallet import BulkWalletChecker
+
+# Passed down a queue once its producers are finished. Every consumer puts it
+# back before exiting so its sibling workers see it too.
+done = object()
+
+
+class Stage:
+
+    def __init__(self, name: str, handle: Callable[[Any], Iterable[Any]], workers: int, queueSize: int):
+        self.name = name
+        self.handle = handle
+        self.workers = max(1, workers)
+        self.inbox: queue.Queue = queue.Queue(maxsize=queueSize)
+        self.processed = 0
+        self.lock = threading.Lock()
+
+    def run(self, emit: Callable[[Any], None], stopped: threading.Event) -> List[threading.Thread]:
+        def work():
+            while True:
+                item = self.inbox.get()
+                if item is done:
+                    self.inbox.put(done)
+                    return
+                # Once the run is stopped, queued items are drained unhandled
+                # so nothing upstream blocks on a full queue.
+                if stopped.is_set():
+                    continue
+                try:
+                    runBudget.check()
+                    for output in self.handle(item):
+                        emit(output)
+                except BudgetExceeded:
+                    stopped.set()
+                    continue
+                except Exception as e:
+                    print(f"[🐲] {self.name} failed for {item}: {e}")
+                with self.lock:
+                    self.processed += 1
+
+        threads = [threading.Thread(target=work, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+
+class Pipeline:
+    # Tokens -> wallets -> wallet results, with a bounded queue in front of
+    # every stage. A full queue blocks the stage feeding it, so scraping never
+    # runs far ahead of wallet checking, and wallets are checked while later
+    # tokens are still being scraped. Each stage drops items it has already
+    # been given, so a wallet found on ten tokens is checked once.
+
+    def __init__(self, queueSize: int = 200):
+        self.queueSize = queueSize
+        self.stages: List[Stage] = []
+        # Set when the run's time budget is spent: no more items are fed or handled.
+        self.stopped = threading.Event()
+
+    def stage(self, name: str, handle: Callable[[Any], Iterable[Any]], workers: int):
+        self.stages.append(Stage(name, handle, workers, self.queueSize))
+        return self
+
+    def run(self, source: Iterable[Any], sink: Callable[[Any], None]) -> None:
+        seen = [set() for _ in self.stages]
+        locks = [threading.Lock() for _ in self.stages]
+
+        def feeder(index: int) -> Callable[[Any], None]:
+            if index == len(self.stages):
+                sinkLock = threading.Lock()
+
+                def emit(item):
+                    with sinkLock:
+                        sink(item)
+                return emit
+
+            def emit(item):
+                if self.stopped.is_set():
+                    return
+                with locks[index]:
+                    if item in seen[index]:
+                        return
+                    seen[index].add(item)
+                self.stages[index].inbox.put(item)
+            return emit
+
+        running = [stage.run(feeder(index + 1), self.stopped) for index, stage in enumerate(self.stages)]
+
+        feed = feeder(0)
+        for item in source:
+            if self.stopped.is_set():
+                break
+            feed(item)
+
+        # Close the stages in order: once a stage's workers have all exited,
+        # nothing more can reach the next one.
+        for index, stage in enumerate(self.stages):
+            stage.inbox.put(done)
+            for thread in running[index]:
+                thread.join()
+            print(f"[🐲] {stage.name}: {stage.processed} processed, {len(seen[index])} unique in.")
+
+
+def walletPipeline(tokens: Iterable[str], sources: List[str], threads: int, useProxies, skipWallets: bool, buyers: int = 40) -> BulkWalletChecker:
+    # tokens -> wallets from the chosen sources ("traders", "holders", "early")
+    # -> BulkWalletChecker, ending in the checker's usual filtered CSV.
+    topTraders, topHolders, earlyBuyers = TopTraders(), TopHolders(), EarlyBuyers()
+    checker = BulkWalletChecker()
+    extractors = {
+        "traders": lambda token: topTraders.walletsFor(token, useProxies),
+        "holders": lambda token: topHolders.walletsFor(token, useProxies),
+        "early": lambda token: earlyBuyers.walletsFor(token, useProxies, buyers),
+    }
+    chosen = [extractors[source] for source in sources]
+
+    def wallets(token):
+        found = []
+        for extract in chosen:
+            found.extend(extract(token))
+        print(f"[🐲] {token}: {len(found)} wallets")
+        return found
+
+    def check(wallet):
+        result = checker.getWalletData(wallet, skipWallets, useProxies)
+        return [] if result is None else [result]
+
+    # Stage workers are OS threads, so they stay within engine.threadLimit
+    # whatever the requested concurrency.
+    pipeline = Pipeline().stage("Tokens", wallets, engine.threadWorkers(threads // 4)).stage("Wallets", check, engine.threadWorkers(threads))
+    writer = checker.openWriter()
+    try:
+        pipeline.run((token.strip() for token in tokens if token.strip()), writer.put)
+        if pipeline.stopped.is_set():
+            checker.budgetExceeded = True
+            print("[🐲] Time budget spent, stopped checking wallets.")
+    finally:
+        writer.close()
+    return checker
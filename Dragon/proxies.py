@@ -0,0 +1,81 @@
+import os
+import time
+import itertools
+import threading
+
+from typing import Dict, List, Optional, Union
+
+proxyPath = os.path.join("Dragon", "data", "Proxies", "proxies.txt")
+
+# How often (seconds) to stat the file for changes; the hot path only ever
+# reads an in-memory list.
+checkInterval = 1.0
+
+Proxy = Union[str, Dict[str, str]]
+
+
+def parseProxy(proxy: str) -> Proxy:
+    if ':' in proxy:
+        parts = proxy.split(':')
+        if len(parts) == 4:
+            ip, port, username, password = parts
+            return {
+                'http': f"http://{username}:{password}@{ip}:{port}",
+                'https': f"http://{username}:{password}@{ip}:{port}"
+            }
+        return {
+            'http': f"http://{proxy}",
+            'https': f"http://{proxy}"
+        }
+    return f"http://{proxy}"
+
+
+class ProxyRegistry:
+
+    def __init__(self, path: str = proxyPath):
+        self.path = path
+        self.proxies: List[Proxy] = []
+        self.mtime = None
+        self.lastCheck = 0.0
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+
+    def load(self) -> List[Proxy]:
+        try:
+            with open(self.path, 'r') as file:
+                return [parseProxy(line.strip()) for line in file if line.strip()]
+        except OSError:
+            return []
+
+    def refresh(self) -> None:
+        now = time.monotonic()
+        if now - self.lastCheck < checkInterval:
+            return
+
+        with self.lock:
+            if now - self.lastCheck < checkInterval:
+                return
+            self.lastCheck = now
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime != self.mtime:
+                self.proxies = self.load()
+                self.mtime = mtime
+
+    def next(self) -> Optional[Proxy]:
+        # Round robin; next() on itertools.count is atomic, so no lock is needed
+        # to hand out entries. Returns None (no proxy) if the file is empty.
+        self.refresh()
+        proxies = self.proxies
+        if not proxies:
+            return None
+        return proxies[next(self.counter) % len(proxies)]
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self.proxies)
+
+
+proxyRegistry = ProxyRegistry()
@@ -0,0 +1,129 @@
+import threading
+import time
+
+from typing import Dict, List, Optional
+from Dragon import endpoints
+
+# Requests per second as (starting rate, ceiling). The limiter adapts between
+# minRate and the ceiling from what the upstream tells us.
+endpointBudgets = {
+    "default": (10.0, 50.0),
+    "walletNew": (15.0, 80.0),
+    "tokenDistro": (5.0, 30.0),
+    "tokenTrades": (8.0, 40.0),
+    "trades": (8.0, 40.0),
+    "transfers": (5.0, 20.0),
+}
+hostBudget = (25.0, 150.0)
+
+minRate = 0.5
+burstSeconds = 0.5
+additiveIncrease = 1.0
+decreaseFactor = 0.5
+decreaseWindow = 1.0
+latencyFactor = 3.0
+rateLimitPause = 2.0
+
+
+class TokenBucket:
+
+    def __init__(self, name: str, rate: float, maxRate: float):
+        self.name = name
+        self.rate = rate
+        self.maxRate = maxRate
+        self.tokens = max(1.0, rate * burstSeconds)
+        self.updated = time.monotonic()
+        self.lastDecrease = 0.0
+        self.latency = None
+        self.baseLatency = None
+        self.lock = threading.Lock()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(max(1.0, self.rate * burstSeconds), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        # Takes a token now and returns how long the caller has to wait for it.
+        # Tokens may go negative: that debt is what spaces waiting callers out.
+        with self.lock:
+            self.refill(time.monotonic())
+            self.tokens -= 1
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def decrease(self, now: float, factor: float) -> bool:
+        # One multiplicative decrease per window, so a wave of 429s caused by
+        # the same burst only halves the rate once.
+        if now - self.lastDecrease < decreaseWindow:
+            return False
+        self.rate = max(minRate, self.rate * factor)
+        self.lastDecrease = now
+        return True
+
+    def record(self, statusCode: int, latency: float, retryAfter: Optional[float] = None) -> None:
+        with self.lock:
+            now = time.monotonic()
+            if statusCode == 429:
+                if self.decrease(now, decreaseFactor):
+                    print(f"[🐲] Rate limited on {self.name}, slowing down to {self.rate:.1f} req/s")
+                self.refill(now)
+                # Pause the bucket; concurrent 429s share one pause rather than stacking.
+                self.tokens = min(self.tokens, -(retryAfter or rateLimitPause) * self.rate)
+                return
+
+            self.latency = latency if self.latency is None else self.latency * 0.8 + latency * 0.2
+            self.baseLatency = self.latency if self.baseLatency is None else min(self.baseLatency, self.latency)
+
+            if self.latency > self.baseLatency * latencyFactor:
+                self.decrease(now, 0.9)
+            elif statusCode < 400:
+                self.rate = min(self.maxRate, self.rate + additiveIncrease / self.rate)
+
+
+class RateLimiter:
+
+    def __init__(self):
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+
+    def bucket(self, name: str, budget) -> TokenBucket:
+        with self.lock:
+            if name not in self.buckets:
+                self.buckets[name] = TokenBucket(name, *budget)
+            return self.buckets[name]
+
+    def bucketsFor(self, url: str) -> List[TokenBucket]:
+        endpoint = endpoints.classify(url)
+        host = endpoints.host(url)
+        return [
+            self.bucket(f"{host}/{endpoint}", endpointBudgets.get(endpoint, endpointBudgets["default"])),
+            self.bucket(host, hostBudget),
+        ]
+
+    def delay(self, url: str) -> float:
+        return max(bucket.reserve() for bucket in self.bucketsFor(url))
+
+    def acquire(self, url: str) -> None:
+        wait = self.delay(url)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquireAsync(self, url: str) -> None:
+        import asyncio
+        wait = self.delay(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def record(self, url: str, statusCode: int, latency: float, retryAfter=None) -> None:
+        try:
+            retryAfter = float(retryAfter) if retryAfter else None
+        except ValueError:
+            retryAfter = None
+        for bucket in self.bucketsFor(url):
+            bucket.record(statusCode, latency, retryAfter)
+
+    def rates(self) -> Dict[str, float]:
+        with self.lock:
+            return {name: bucket.rate for name, bucket in self.buckets.items()}
+
+
+limiter = RateLimiter()
@@ -0,0 +1,131 @@
+import time
+import random
+
+from typing import Any, Awaitable, Callable, Optional
+
+# Statuses that mean "try again later"; any other non-200 (400, 403, 404...)
+# will come back the same however many times we ask.
+retriableStatuses = {408, 425, 429, 500, 502, 503, 504, 520, 521, 522, 524}
+
+
+class FatalError(Exception):
+    pass
+
+
+class RetryError(Exception):
+    pass
+
+
+class BudgetExceeded(FatalError):
+    pass
+
+
+class HttpError(Exception):
+
+    def __init__(self, statusCode: int, url: str):
+        super().__init__(f"HTTP {statusCode} for {url}")
+        self.statusCode = statusCode
+
+
+class InvalidPayload(Exception):
+    pass
+
+
+def retriable(error: BaseException) -> bool:
+    if isinstance(error, FatalError):
+        return False
+    if isinstance(error, HttpError):
+        return error.statusCode in retriableStatuses
+    # A response that parsed but doesn't have the shape we expect won't fix itself.
+    if isinstance(error, (KeyError, IndexError, TypeError, AttributeError)):
+        return False
+    return isinstance(error, Exception)
+
+
+class RunBudget:
+
+    def __init__(self):
+        self.expires: Optional[float] = None
+
+    def start(self, seconds: Optional[float]) -> None:
+        self.expires = time.monotonic() + seconds if seconds else None
+
+    def remaining(self) -> Optional[float]:
+        return None if self.expires is None else self.expires - time.monotonic()
+
+    def check(self) -> None:
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise BudgetExceeded("run time budget exhausted")
+
+
+# Shared by every request in the process, set from --time-budget.
+runBudget = RunBudget()
+
+
+class RetryPolicy:
+
+    def __init__(self, attempts: int = 4, baseDelay: float = 0.5, maxDelay: float = 10.0, deadline: Optional[float] = 90.0):
+        self.attempts = attempts
+        self.baseDelay = baseDelay
+        self.maxDelay = maxDelay
+        self.deadline = deadline
+
+    def backoff(self, attempt: int) -> float:
+        # Full jitter: a random wait up to the exponential cap, so workers that
+        # failed together don't all come back at the same instant.
+        return random.uniform(0, min(self.maxDelay, self.baseDelay * 2 ** attempt))
+
+    def nextWait(self, attempt: int, deadline: Optional[float]) -> Optional[float]:
+        if attempt + 1 >= self.attempts:
+            return None
+        wait = self.backoff(attempt)
+        for remaining in (None if deadline is None else deadline - time.monotonic(), runBudget.remaining()):
+            if remaining is not None and remaining <= wait:
+                return None
+        return wait
+
+    def start(self) -> Optional[float]:
+        return time.monotonic() + self.deadline if self.deadline else None
+
+    def run(self, fn: Callable[[], Any], label: str = "request") -> Any:
+        deadline = self.start()
+        attempt = 0
+        while True:
+            runBudget.check()
+            try:
+                return fn()
+            except Exception as e:
+                if not retriable(e):
+                    raise
+                error = e
+            wait = self.nextWait(attempt, deadline)
+            if wait is None:
+                raise RetryError(f"{label} failed after {attempt + 1} attempts: {error}") from error
+            time.sleep(wait)
+            attempt += 1
+
+    async def runAsync(self, fn: Callable[[], Awaitable[Any]], label: str = "request") -> Any:
+        import asyncio
+        deadline = self.start()
+        attempt = 0
+        while True:
+            runBudget.check()
+            try:
+                return await fn()
+            except Exception as e:
+                if not retriable(e):
+                    raise
+                error = e
+            wait = self.nextWait(attempt, deadline)
+            if wait is None:
+                raise RetryError(f"{label} failed after {attempt + 1} attempts: {error}") from error
+            await asyncio.sleep(wait)
+            attempt += 1
+
+
+defaultPolicy = RetryPolicy()
+
+# Wallet stats are the bulk of every run: allow a few more, slower retries than
+# the default, but never let one dead wallet hold a worker indefinitely.
+walletPolicy = RetryPolicy(attempts=6, baseDelay=1.0, maxDelay=15.0, deadline=120.0)
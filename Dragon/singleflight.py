@@ -0,0 +1,63 @@
+import threading
+
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Hashable
+
+# asyncio is only imported once something actually runs on the async engine.
+if TYPE_CHECKING:
+    import asyncio
+
+
+class Call:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+
+    def __init__(self):
+        self.calls: Dict[Hashable, Call] = {}
+        self.lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        # The first caller for a key runs fn; anyone asking for the same key
+        # while it is in flight waits and gets the same result (or exception).
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+
+    def __init__(self):
+        self.calls: Dict[Hashable, "asyncio.Future"] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        import asyncio
+        call = self.calls.get(key)
+        if call is None:
+            call = self.calls[key] = asyncio.ensure_future(fn())
+            call.add_done_callback(lambda _: self.calls.pop(key, None))
+        # shield() so one waiter being cancelled doesn't cancel the fetch for the rest.
+        return await asyncio.shield(call)
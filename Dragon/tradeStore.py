@@ -0,0 +1,148 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from Dragon import pagination
+
+storePath = os.path.join("Dragon", "data", "trades.sqlite3")
+
+
+class TradeStore:
+
+    def __init__(self, path: str = storePath):
+        self.path = path
+        self.local = threading.local()
+
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(
+                "CREATE TABLE IF NOT EXISTS trades ("
+                "chain TEXT, token TEXT, tx_hash TEXT, maker TEXT, event TEXT, timestamp INTEGER, payload TEXT, "
+                "PRIMARY KEY (chain, token, tx_hash, maker, event));"
+                "CREATE INDEX IF NOT EXISTS tradesTimestamp ON trades (chain, token, timestamp);"
+                "CREATE INDEX IF NOT EXISTS tradesTxHash ON trades (chain, token, tx_hash);"
+                "CREATE TABLE IF NOT EXISTS syncs ("
+                "chain TEXT, token TEXT, complete INTEGER, resume_cursor TEXT, synced_at REAL, "
+                "PRIMARY KEY (chain, token));"
+            )
+            self.local.connection = connection
+        return connection
+
+    def state(self, chain: str, token: str) -> Optional[Tuple[bool, Optional[str]]]:
+        row = self.connection().execute(
+            "SELECT complete, resume_cursor FROM syncs WHERE chain = ? AND token = ?", (chain, token)
+        ).fetchone()
+        return None if row is None else (bool(row[0]), row[1])
+
+    def saveState(self, chain: str, token: str, complete: bool, resumeCursor: Optional[str]) -> None:
+        self.connection().execute(
+            "INSERT OR REPLACE INTO syncs (chain, token, complete, resume_cursor, synced_at) VALUES (?, ?, ?, ?, ?)",
+            (chain, token, int(complete), resumeCursor, time.time())
+        )
+
+    def knownHashes(self, chain: str, token: str, txHashes: List[str]) -> Set[str]:
+        if not txHashes:
+            return set()
+        placeholders = ",".join("?" * len(txHashes))
+        rows = self.connection().execute(
+            f"SELECT tx_hash FROM trades WHERE chain = ? AND token = ? AND tx_hash IN ({placeholders})",
+            (chain, token, *txHashes)
+        )
+        return {row[0] for row in rows}
+
+    def insert(self, chain: str, token: str, trades: List[Dict[str, Any]]) -> None:
+        self.connection().executemany(
+            "INSERT OR IGNORE INTO trades (chain, token, tx_hash, maker, event, timestamp, payload) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(chain, token, trade.get('tx_hash'), trade.get('maker'), trade.get('event'), trade.get('timestamp'), json.dumps(trade))
+             for trade in trades]
+        )
+
+    def walkTail(self, chain: str, token: str, pages: Iterator[pagination.Page], cursor: Optional[str]) -> int:
+        # Stores every page and checkpoints the cursor after each one. A final
+        # page that came back empty may have been a failed fetch rather than the
+        # end of the history, so it leaves the sync resumable instead of complete.
+        connection = self.connection()
+        count = 0
+        for history, nextCursor in pages:
+            count += 1
+            complete = not nextCursor and bool(history)
+            with connection:
+                self.insert(chain, token, history)
+                self.saveState(chain, token, complete, nextCursor or (None if complete else cursor))
+            cursor = nextCursor
+        return count
+
+    def sync(self, chain: str, token: str, baseUrl: str, fetchPage: Callable[[str], pagination.Page], concurrency: int = 1) -> int:
+        # Brings the stored history of a token up to date and returns how many
+        # pages were fetched. After a complete first sync, only trades newer
+        # than the newest stored one are fetched: the walk stops at the first
+        # tx_hash we already have. An interrupted sync resumes from its cursor.
+        state = self.state(chain, token)
+        if state is None or (not state[0] and state[1] is None):
+            return self.walkTail(chain, token, pagination.iterPagesParallel(baseUrl, fetchPage, concurrency), None)
+
+        complete, resumeCursor = state
+        pages = 0
+        fresh = []
+        reachedKnown = False
+        for history, cursor in pagination.iterPages(baseUrl, fetchPage, prefetch=False):
+            pages += 1
+            known = self.knownHashes(chain, token, [trade.get('tx_hash') for trade in history])
+            for trade in history:
+                if trade.get('tx_hash') in known:
+                    reachedKnown = True
+                    break
+                fresh.append(trade)
+            if reachedKnown or not cursor:
+                break
+
+        # New trades are only stored once the walk has joined up with what we
+        # already have; storing a partial head would hide the gap behind it.
+        if reachedKnown or (history and not cursor):
+            with self.connection():
+                self.insert(chain, token, fresh)
+                if complete:
+                    self.saveState(chain, token, True, None)
+
+        if not complete:
+            pages += self.walkTail(chain, token, pagination.iterPages(baseUrl, fetchPage, cursor=resumeCursor), resumeCursor)
+        return pages
+
+    def makers(self, chain: str, token: str, event: Optional[str] = None) -> Iterator[str]:
+        query = "SELECT DISTINCT maker FROM trades WHERE chain = ? AND token = ?"
+        params: Tuple[Any, ...] = (chain, token)
+        if event is not None:
+            query += " AND event = ?"
+            params += (event,)
+        for row in self.connection().execute(query, params):
+            yield row[0]
+
+    def trades(self, chain: str, token: str, event: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        # Oldest first. Pages are stored newest first, so within one second the
+        # higher rowid is the earlier trade.
+        query = "SELECT payload FROM trades WHERE chain = ? AND token = ?"
+        params: Tuple[Any, ...] = (chain, token)
+        if event is not None:
+            query += " AND event = ?"
+            params += (event,)
+        for row in self.connection().execute(query + " ORDER BY timestamp ASC, rowid DESC", params):
+            yield json.loads(row[0])
+
+    def tradesBetween(self, chain: str, token: str, start: int, end: int) -> Iterator[Dict[str, Any]]:
+        rows = self.connection().execute(
+            "SELECT payload FROM trades WHERE chain = ? AND token = ? AND timestamp BETWEEN ? AND ? ORDER BY timestamp DESC",
+            (chain, token, start, end)
+        )
+        for row in rows:
+            yield json.loads(row[0])
+
+
+tradeStore = TradeStore()
@@ -1,177 +1,90 @@
 import json
-import time
-import random
-import tls_client
 
-from fake_useragent import UserAgent
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from collections import defaultdict
 
-from threading import Event
-globalRatelimitEvent = Event()
+from Dragon import engine, transport
+from Dragon.proxies import proxyRegistry
 
-ua = UserAgent(os='linux', browsers=['firefox'])
 
 class TopTraders:
 
     def __init__(self):
-        self.sendRequest = tls_client.Session(client_identifier='chrome_103')
-        
         self.shorten = lambda s: f"{s[:4]}...{s[-5:]}" if len(s) >= 9 else s
         self.allData = {}
         self.allAddresses = set()
         self.addressFrequency = defaultdict(int)
         self.totalTraders = 0
-        self.proxyPosition = 0
     
-    def randomise(self):
-        self.identifier = random.choice(
-            [browser for browser in tls_client.settings.ClientIdentifiers.__args__
-             if browser.startswith(('chrome', 'safari', 'firefox', 'opera'))]
-        )
-        parts = self.identifier.split('_')
-        identifier, version, *rest = parts
-        identifier = identifier.capitalize()
-        
-        self.sendRequest = tls_client.Session(random_tls_extension_order=True, client_identifier=self.identifier)
-        self.sendRequest.timeout_seconds = 60
-
-        if identifier == 'Opera':
-            identifier = 'Chrome'
-            osType = 'Windows'
-        elif version.lower() == 'ios':
-            osType = 'iOS'
-        else:
-            osType = 'Windows'
+    def topTradersUrl(self, contractAddress: str):
+        return f"http://172.86.110.62:1337/defi/quotation/v1/tokens/top_traders/sol/{contractAddress}?orderby=profit&direction=desc"
 
+    def fetchTopTraders(self, contractAddress: str, useProxies):
         try:
-            self.user_agent = UserAgent(os=[osType]).random
-        except Exception:
-            self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:82.0) Gecko/20100101 Firefox/82.0"
-
-        self.headers = {
-            'Host': 'gmgn.ai',
-            'accept': 'application/json, text/plain, */*',
-            'accept-language': 'fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7',
-            'dnt': '1',
-            'priority': 'u=1, i',
-            'referer': 'https://gmgn.ai/?chain=sol',
-            'user-agent': self.user_agent
-        }
-
-    def loadProxies(self):
-        with open("Dragon/data/Proxies/proxies.txt", 'r') as file:
-            proxies = file.read().splitlines()
-
-        formatted_proxies = []
-        for proxy in proxies:
-            if ':' in proxy:  
-                parts = proxy.split(':')
-                if len(parts) == 4:
-                    ip, port, username, password = parts
-                    formatted_proxies.append({
-                        'http': f"http://{username}:{password}@{ip}:{port}",
-                        'https': f"http://{username}:{password}@{ip}:{port}"
-                    })
-                else:
-                    formatted_proxies.append({
-                        'http': f"http://{proxy}",
-                        'https': f"http://{proxy}"
-                    })
-            else:
-                formatted_proxies.append(f"http://{proxy}")        
-        return formatted_proxies
-
-    def configureProxy(self, proxy):
-        if isinstance(proxy, dict): 
-            self.sendRequest.proxies = {
-                'http': proxy.get('http'),
-                'https': proxy.get('https')
-            }
-        elif isinstance(proxy, str):
-            self.sendRequest.proxies = {
-                'http': proxy,
-                'https': proxy
-            }
-        else:
-            self.sendRequest.proxies = None
-        return proxy
-    
-    def getNextProxy(self):
-        proxies = self.loadProxies()
-        proxy = proxies[self.proxyPosition % len(proxies)]
-        self.proxyPosition += 1
-        return proxy
+            data = transport.getJson(self.topTradersUrl(contractAddress), proxy=proxyRegistry.next if useProxies else None, accept=lambda payload: payload.get('data'))
+        except Exception as e:
+            print(f"[🐲] Failed to fetch data for contract {contractAddress}: {e}")
+            return []
 
-    def fetchTopTraders(self, contractAddress: str, useProxies):
-        url = f"http://172.86.110.62:1337/defi/quotation/v1/tokens/top_traders/sol/{contractAddress}?orderby=profit&direction=desc"
-        retries = 3
-
-        for attempt in range(retries):
-            try:
-                if globalRatelimitEvent.is_set():
-                    print(f"[🐲] Global rate limit active. Waiting before fetching top traders for contract {contractAddress}...")
-                    globalRatelimitEvent.wait()
-                
-                self.randomise()
-                proxy = self.getNextProxy() if useProxies else None
-                self.configureProxy(proxy)
-                response = self.sendRequest.get(url, headers=self.headers, allow_redirects=True)
-                
-                if response.status_code == 429:
-                    print(f"[🐲] Received 429 for contract {contractAddress}. Triggering global cooldown for 7.5 seconds...")
-                    globalRatelimitEvent.set()
-                    time.sleep(7.5)
-                    globalRatelimitEvent.clear()
-                    continue
-
-                data = response.json().get('data', None)
-                if data:
-                    print(f"[🐲] Successfully grabbed top traders for {contractAddress}")
-                    return data
-            except Exception as e:
-                print(f"[🐲] Error fetching data on attempt {attempt+1} for contract {contractAddress}: {e}")
-                
-            time.sleep(1)
-        
-        print(f"[🐲] Failed to fetch data for contract {contractAddress} after {retries} attempts.")
-        return []
+        print(f"[🐲] Successfully grabbed top traders for {contractAddress}")
+        return data['data']
+
+    async def fetchTopTradersAsync(self, fetchEngine, contractAddress: str, useProxies):
+        try:
+            data = await fetchEngine.getJson(self.topTradersUrl(contractAddress), proxy=proxyRegistry.next if useProxies else None, accept=lambda payload: payload.get('data'))
+        except Exception as e:
+            print(f"[🐲] Failed to fetch data for contract {contractAddress}: {e}")
+            return []
+
+        print(f"[🐲] Successfully grabbed top traders for {contractAddress}")
+        return data['data']
+
+    def walletsFor(self, contractAddress: str, useProxies):
+        return [trader['address'] for trader in self.fetchTopTraders(contractAddress, useProxies) if trader.get('profit_change')]
+
+    def processTopTraders(self, contractAddress, response):
+        self.allData[contractAddress] = {}
+        self.totalTraders += len(response)
+
+        for top_trader in response:
+            multiplier_value = top_trader['profit_change']
+
+            if multiplier_value:
+                address = top_trader['address']
+                self.addressFrequency[address] += 1 
+                self.allAddresses.add(address)
+
+                bought_usd = f"${top_trader['total_cost']:,.2f}"
+                total_profit = f"${top_trader['realized_profit']:,.2f}"
+                unrealized_profit = f"${top_trader['unrealized_profit']:,.2f}"
+                multiplier = f"{multiplier_value:.2f}x"
+                buys = f"{top_trader['buy_tx_count_cur']}"
+                sells = f"{top_trader['sell_tx_count_cur']}"
+
+                self.allData[address] = {
+                    "boughtUsd": bought_usd,
+                    "totalProfit": total_profit,
+                    "unrealizedProfit": unrealized_profit,
+                    "multiplier": multiplier,
+                    "buys": buys,
+                    "sells": sells
+                }
 
     def topTraderData(self, contractAddresses, threads, useProxies):
-        with ThreadPoolExecutor(max_workers=threads) as executor:
-            futures = {executor.submit(self.fetchTopTraders, address, useProxies): address for address in contractAddresses}
-            
-            for future in as_completed(futures):
-                contract_address = futures[future]
-                response = future.result()
-
-                self.allData[contract_address] = {}
-                self.totalTraders += len(response)
-
-                for top_trader in response:
-                    multiplier_value = top_trader['profit_change']
-                    
-                    if multiplier_value:
-                        address = top_trader['address']
-                        self.addressFrequency[address] += 1 
-                        self.allAddresses.add(address)
-                        
-                        bought_usd = f"${top_trader['total_cost']:,.2f}"
-                        total_profit = f"${top_trader['realized_profit']:,.2f}"
-                        unrealized_profit = f"${top_trader['unrealized_profit']:,.2f}"
-                        multiplier = f"{multiplier_value:.2f}x"
-                        buys = f"{top_trader['buy_tx_count_cur']}"
-                        sells = f"{top_trader['sell_tx_count_cur']}"
-                        
-                        self.allData[address] = {
-                            "boughtUsd": bought_usd,
-                            "totalProfit": total_profit,
-                            "unrealizedProfit": unrealized_profit,
-                            "multiplier": multiplier,
-                            "buys": buys,
-                            "sells": sells
-                        }
-        
+        if engine.useAsync(threads):
+            engine.runAll(
+                lambda fetchEngine, address: self.fetchTopTradersAsync(fetchEngine, address, useProxies),
+                contractAddresses,
+                threads,
+                self.processTopTraders
+            )
+        else:
+            with ThreadPoolExecutor(max_workers=engine.threadWorkers(threads)) as executor:
+                futures = {executor.submit(self.fetchTopTraders, address, useProxies): address for address in contractAddresses}
+
+                for future in as_completed(futures):
+                    self.processTopTraders(futures[future], future.result())
+
         repeatedAddresses = [address for address, count in self.addressFrequency.items() if count > 1]
         
         identifier = self.shorten(list(self.allAddresses)[0])
@@ -0,0 +1,131 @@
+import time
+import random
+import threading
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Union
+from Dragon.cache import normaliseUrl, responseCache
+from Dragon.ratelimit import limiter
+from Dragon.retry import HttpError, InvalidPayload, RetryPolicy, defaultPolicy
+from Dragon.singleflight import SingleFlight
+
+# tls_client loads a native library and fake_useragent its UA database, so both
+# are imported on first use: a run answered from the cache, or one that only
+# prints --help, never pays for them.
+if TYPE_CHECKING:
+    import tls_client
+
+fallbackUserAgent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:82.0) Gecko/20100101 Firefox/82.0"
+
+baseHeaders = {
+    'Host': 'gmgn.ai',
+    'accept': 'application/json, text/plain, */*',
+    'accept-language': 'fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7',
+    'dnt': '1',
+    'priority': 'u=1, i',
+    'referer': 'https://gmgn.ai/?chain=sol',
+}
+
+# Every worker thread keeps one tls_client session (and the browser profile it
+# was created with) for its whole lifetime, so the connection is kept alive
+# between requests instead of being re-negotiated each time.
+workerState = threading.local()
+
+# Loading the UA database is expensive, only do it once per OS type per process.
+userAgentLock = threading.Lock()
+userAgents = {}
+
+# Concurrent GETs for the same URL share one upstream request.
+inFlight = SingleFlight()
+
+
+def clientIdentifiers() -> List[str]:
+    import tls_client
+    return [browser for browser in tls_client.settings.ClientIdentifiers.__args__
+            if browser.startswith(('chrome', 'safari', 'firefox', 'opera'))]
+
+
+def userAgentFor(clientIdentifier: str) -> str:
+    identifier, version, *rest = clientIdentifier.split('_')
+    osType = 'iOS' if identifier != 'opera' and version.lower() == 'ios' else 'Windows'
+
+    try:
+        with userAgentLock:
+            if osType not in userAgents:
+                from fake_useragent import UserAgent
+                userAgents[osType] = UserAgent(os=[osType])
+            return userAgents[osType].random
+    except Exception:
+        return fallbackUserAgent
+
+
+def newSession(clientIdentifier: Optional[str] = None) -> "tls_client.Session":
+    import tls_client
+    clientIdentifier = clientIdentifier or random.choice(clientIdentifiers())
+    session = tls_client.Session(random_tls_extension_order=True, client_identifier=clientIdentifier)
+    session.timeout_seconds = 60
+
+    workerState.session = session
+    workerState.headers = {**baseHeaders, 'user-agent': userAgentFor(clientIdentifier)}
+    return session
+
+
+def session() -> "tls_client.Session":
+    current = getattr(workerState, 'session', None)
+    return current if current is not None else newSession()
+
+
+def defaultHeaders() -> Dict[str, str]:
+    session()
+    return workerState.headers
+
+
+def resetSession() -> None:
+    # Drop the calling thread's session, e.g. after a broken connection.
+    current = getattr(workerState, 'session', None)
+    workerState.session = None
+    if current is not None:
+        try:
+            current.close()
+        except Exception:
+            pass
+
+
+def fetch(url: str, proxy: Optional[Union[str, Dict[str, str]]], headers: Optional[Dict[str, str]], useCache: bool, **kwargs):
+    requestHeaders = defaultHeaders() if headers is None else headers
+    limiter.acquire(url)
+    started = time.monotonic()
+    try:
+        response = session().get(url, headers=requestHeaders, proxy=proxy, **kwargs)
+    except Exception:
+        resetSession()
+        raise
+    limiter.record(url, response.status_code, time.monotonic() - started, response.headers.get('Retry-After'))
+    if useCache:
+        responseCache.store(url, response.status_code, response.text)
+    return response
+
+
+def get(url: str, proxy: Optional[Union[str, Dict[str, str]]] = None, headers: Optional[Dict[str, str]] = None, useCache: bool = True, **kwargs):
+    cached = responseCache.lookup(url) if useCache else None
+    if cached is not None:
+        return cached
+
+    return inFlight.do(normaliseUrl(url), lambda: fetch(url, proxy, headers, useCache, **kwargs))
+
+
+def getJson(url: str, proxy=None, headers: Optional[Dict[str, str]] = None, policy: Optional[RetryPolicy] = None,
+            accept: Optional[Callable[[Any], bool]] = None, **kwargs) -> Any:
+    # GET + parse under a retry policy. `proxy` may be a callable (e.g. proxyRegistry.next)
+    # so every attempt goes out through a fresh proxy; `accept` rejects 200s whose
+    # payload isn't usable yet (msg != success, empty data...) and retries them.
+    def attempt():
+        response = get(url, proxy=proxy() if callable(proxy) else proxy, headers=headers, **kwargs)
+        if response.status_code != 200:
+            raise HttpError(response.status_code, url)
+        data = response.json()
+        if accept is not None and not accept(data):
+            responseCache.discard(url)
+            raise InvalidPayload(f"unusable payload from {url}")
+        return data
+
+    return (policy or defaultPolicy).run(attempt, url)
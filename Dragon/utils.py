@@ -1,11 +1,25 @@
 import os
+import sys
 import glob
-from typing import List, Tuple, Union
+from typing import Iterator, List, Tuple, Union
 
 from colorama import Fore, init
+from Dragon.proxies import proxyRegistry
 
 init(autoreset=True)
 
+def iterLines(path: str) -> Iterator[str]:
+    # Non-empty lines, stripped, read only as they are consumed. "-" is stdin.
+    if path == "-":
+        for line in sys.stdin:
+            if line.strip():
+                yield line.strip()
+        return
+    with open(path, 'r') as file:
+        for line in file:
+            if line.strip():
+                yield line.strip()
+
 def clear() -> None:
     os.system("cls||clear")
 
@@ -30,9 +44,7 @@ WELCOME TO..
 
 
 def checkProxyFile() -> bool:
-    proxyPath = os.path.join("Dragon", "data", "Proxies", "proxies.txt")
-    with open(proxyPath, "r", encoding="utf-8") as fileObj:
-        return bool(fileObj.readlines())
+    return len(proxyRegistry) > 0
 
 
 def chains() -> Tuple[List[str], str]:
@@ -51,6 +63,8 @@ def gmgnTools(site: str) -> Union[Tuple[List[str], str], str]:
             "Pump.Fun Completing Token Scraper",
             "Pump.Fun Soaring Token Scraper",
             "Pump.Fun Bonded Token Scraper",
+            "Watch Pump.Fun + Moonshot For New Tokens",
+            "Pipeline: Tokens -> Wallets -> Wallet Checker",
         ]
     elif siteLower == "moonshot":
         options = [
@@ -58,6 +72,8 @@ def gmgnTools(site: str) -> Union[Tuple[List[str], str], str]:
             "Moonshot Completing Token Scraper",
             "Moonshot Soaring Token Scraper",
             "Moonshot Bonded Token Scraper",
+            "Watch Pump.Fun + Moonshot For New Tokens",
+            "Pipeline: Tokens -> Wallets -> Wallet Checker",
         ]
     else:
         return f"[🐲] Error, Dragon does not support the site '{site}'"
@@ -1,11 +1,13 @@
 import argparse
 import json
 import os
-import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from .wallet import BulkWalletChecker, globalRatelimitEvent
+from . import engine, transport
+from .cache import responseCache
+from .proxies import proxyRegistry
+from .retry import runBudget, walletPolicy
 
 
 API_URL_TEMPLATE = (
@@ -37,44 +39,28 @@ def flatten(nested: Dict[str, Any], parent_key: str = "", sep: str = ".") -> Dic
 
 class WalletFullFetcher:
     def __init__(self, use_proxies: bool = False):
-        self.base = BulkWalletChecker()
         self.use_proxies = use_proxies
 
     def _prepare(self):
-        self.base.randomise()
-        proxy = self.base.getNextProxy() if self.use_proxies else None
-        self.base.configureProxy(proxy)
+        return proxyRegistry.next() if self.use_proxies else None
 
     def fetch_one(self, wallet: str) -> Optional[Dict[str, Any]]:
         url = API_URL_TEMPLATE.format(wallet=wallet)
-        while True:
-            try:
-                if globalRatelimitEvent.is_set():
-                    globalRatelimitEvent.wait()
-
-                self._prepare()
-                response = self.base.sendRequest.get(url, headers=self.base.headers)
-
-                if response.status_code == 429:
-                    globalRatelimitEvent.set()
-                    time.sleep(7.5)
-                    globalRatelimitEvent.clear()
-                    continue
-
-                if response.status_code == 200:
-                    payload = response.json()
-                    if payload.get("msg") == "success":
-                        data = payload.get("data", {})
-                        # Return raw data with the wallet id included for reference
-                        return {"wallet": wallet, **data}
-                    return None
-            except Exception:
-                # Reuse the same backoff as wallet.py
-                time.sleep(7.5)
+        try:
+            payload = transport.getJson(url, proxy=self._prepare, policy=walletPolicy)
+        except Exception as e:
+            print(f"[🐲] Failed to fetch {wallet}: {e}")
+            return None
+
+        if payload.get("msg") == "success":
+            data = payload.get("data", {})
+            # Return raw data with the wallet id included for reference
+            return {"wallet": wallet, **data}
+        return None
 
     def fetch_many(self, wallets: Iterable[str], threads: int = 8) -> List[Dict[str, Any]]:
         results: List[Dict[str, Any]] = []
-        with ThreadPoolExecutor(max_workers=threads) as executor:
+        with ThreadPoolExecutor(max_workers=engine.threadWorkers(threads)) as executor:
             future_map = {executor.submit(self.fetch_one, w): w for w in wallets}
             for future in as_completed(future_map):
                 data = future.result()
@@ -162,12 +148,31 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Do not write any files; only print to stdout if --print is set",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always hit the API instead of reusing cached responses",
+    )
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=None,
+        help="Only reuse cached responses younger than this many seconds",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        help="Stop retrying and starting requests after this many seconds",
+    )
     return parser
 
 
 def main():
     parser = build_parser()
     args = parser.parse_args()
+    responseCache.configure(enabled=not args.no_cache, maxAge=args.max_age)
+    runBudget.start(args.time_budget)
 
     wallets = read_wallets_from_source(args.source)
     fetcher = WalletFullFetcher(use_proxies=args.use_proxies)
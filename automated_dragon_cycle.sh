@@ -33,28 +33,15 @@ stop_coin_monitor() {
     pkill -f "coin-transaction-monitor.js" 2>/dev/null
 }
 
-# Function to run Dragon with automated input
+# Function to run the Dragon wallet checker
 run_dragon() {
     echo "[INFO] Starting Dragon Wallet Checker"
-    echo "[INFO] Automated sequence: 1 -> 2 -> 2 -> 7 -> n -> n -> 10"
     echo
-    
-    # Create input file for automated Dragon interaction
-    cat > dragon_input.txt << EOF
-1
-2
-3
-7
-n
-n
-10
-EOF
-    
-    # Run Dragon with automated input
-    python dragon.py < dragon_input.txt
-    
-    # Clean up input file
-    rm -f dragon_input.txt
+
+    # Prints one JSON summary line and exits non-zero on failure.
+    if ! python dragon.py sol wallets --input "Dragon/data/Solana/BulkWallet/wallets.txt" --threads 7; then
+        echo "[WARN] Dragon wallet checker failed, see the summary above."
+    fi
 }
 
 # Main cycle function
@@ -114,7 +101,6 @@ cleanup() {
     echo
     echo "[INFO] Received interrupt signal. Cleaning up..."
     stop_coin_monitor
-    rm -f dragon_input.txt
     echo "[INFO] Cleanup completed. Exiting."
     exit 0
 }
@@ -1,17 +1,26 @@
-from Dragon import (
-    BundleFinder, ScanAllTx, BulkWalletChecker, TopTraders, TimestampTransactions,
-    CopyTradeWalletFinder, TopHolders, EarlyBuyers,
-    EthBulkWalletChecker, EthTopTraders, EthTimestampTransactions, EthScanAllTx,
-    utils, purgeFiles, checkProxyFile,
-    BscBulkWalletChecker, BscTopTraders,
-    gmgnTools, GMGN
-)
+import sys
+import json
+import time
+import argparse
+import itertools
+
+import Dragon
+
+# Module classes are reached through the package (Dragon.BundleFinder...) so
+# each is only imported when a menu option or command actually uses it.
+from Dragon import utils, purgeFiles, checkProxyFile, gmgnTools, responseCache, runBudget
 
 purgeFilesUtil = utils.purgeFiles
 clearScreen = utils.clear
 bannerText = utils.banner()
 
-def getThreads(defaultThreads=40, maxAllowed=100):
+def maxThreads(asyncCapable=False):
+    # Only modules with an asyncio path may go past engine.threadLimit; every
+    # other one runs one OS thread per worker.
+    return Dragon.engine.asyncLimit if asyncCapable and Dragon.engine.available() else Dragon.engine.threadLimit
+
+def getThreads(defaultThreads=40, asyncCapable=False):
+    maxAllowed = maxThreads(asyncCapable)
     while True:
         threadsInput = input("[❓] Threads > ")
         try:
@@ -19,11 +28,24 @@ def getThreads(defaultThreads=40, maxAllowed=100):
             if threads > maxAllowed:
                 print(f"[🐲] Using a maximum of {maxAllowed} threads. Automatically set to {defaultThreads}.")
                 return defaultThreads
+            if Dragon.engine.useAsync(threads):
+                print(f"[🐲] {threads} exceeds {Dragon.engine.threadLimit} threads, running on the asyncio engine.")
             return threads
         except ValueError:
             print(f"[🐲] Invalid input. Defaulting to {defaultThreads} threads.")
             return defaultThreads
 
+def parseTimestampWindows(starts, ends):
+    # Several windows can be scanned in one pass with comma separated starts and ends.
+    starts = [int(value) for value in starts.split(",")]
+    ends = [int(value) for value in ends.split(",")]
+    if len(starts) != len(ends):
+        raise ValueError("the number of start and end timestamps must match")
+    return (starts, ends) if len(starts) > 1 else (starts[0], ends[0])
+
+def getTimestampWindows():
+    return parseTimestampWindows(input("[❓] Start UNIX Timestamp > "), input("[❓] End UNIX Timestamp > "))
+
 def getProxiesSetting():
     while True:
         proxiesInput = input("[❓] Use Proxies? (Y/N) > ").strip().lower()
@@ -39,7 +61,9 @@ def getProxiesSetting():
         else:
             print("[🐲] Invalid input. Please enter Y or N.")
 
-def selectFile(chainName):
+def selectFile(chainName, lazy=False):
+    # lazy: return the file's lines as an iterator that reads as it goes,
+    # for wallet lists too big to load up front.
     filesChoice, files = utils.searchForTxt(chain=chainName)
     print("\n[🐲] Available files:\n" + filesChoice)
 
@@ -63,6 +87,15 @@ def selectFile(chainName):
                 filePath = input("[🐲] Enter filename/path > ").strip()
             else:
                 filePath = f"Dragon/data/{chainDirectory}/{files[fileSelection - 1]}"
+            if lazy:
+                items = utils.iterLines(filePath)
+                first = next(items, None)
+                if first is not None:
+                    print(f"[🐲] Streaming items from {filePath}.")
+                    return itertools.chain([first], items)
+                print("[🐲] File is empty. Try another file.")
+                continue
+
             with open(filePath, 'r') as f:
                 items = f.read().splitlines()
 
@@ -89,8 +122,53 @@ def promptSkipWallets():
             return choice == "Y"
         print("[🐲] Invalid input.")
 
+def promptResume():
+    while True:
+        choice = input("[❓] Resume: skip wallets already in wallets_1.csv or checked by the last run (Y/N)> ").strip().upper()
+        if choice in ["Y", "N"]:
+            return choice == "Y"
+        print("[🐲] Invalid input.")
+
+def promptUseStore():
+    while True:
+        choice = input("[❓] Sync into the local trade store and query it (Y/N)> ").strip().upper()
+        if choice in ["Y", "N"]:
+            return choice == "Y"
+        print("[🐲] Invalid input.")
+
+def promptBatch(description):
+    while True:
+        choice = input(f"[❓] Batch mode: {description} (Y/N)> ").strip().upper()
+        if choice in ["Y", "N"]:
+            return choice == "Y"
+        print("[🐲] Invalid input.")
+
+def promptSameSlot():
+    while True:
+        choice = input("[❓] Detect from trade history only, no per-transaction lookups (Y/N)> ").strip().upper()
+        if choice in ["Y", "N"]:
+            return choice == "Y"
+        print("[🐲] Invalid input.")
+
+def getWalletSources():
+    while True:
+        sources = [source.strip().lower() for source in input("[❓] Wallet sources, comma separated (traders, holders, early) > ").split(",") if source.strip()]
+        if sources and all(source in ["traders", "holders", "early"] for source in sources):
+            return sources
+        print("[🐲] Invalid input.")
+
+def getCopyWindow():
+    # Blank means no limit of that kind; at least one of the two must be set.
+    seconds = input("[❓] Follow window in seconds (blank for none) > ").strip()
+    trades = input("[❓] Follow window in buys (blank for none) > ").strip()
+    seconds, trades = int(seconds) if seconds else None, int(trades) if trades else None
+    if seconds is None and trades is None:
+        raise ValueError("set a window in seconds, in buys, or both")
+    minTokens = input("[❓] Minimum tokens followed in (default 2) > ").strip()
+    return seconds, trades, int(minTokens) if minTokens else 2
+
 def gmgn():
-    gmgnInstance = GMGN()
+    gmgnInstance = Dragon.GMGN()
     options, optionsChoice = utils.choices(chain="GMGN")
     print(optionsChoice)
     while True:
@@ -109,10 +187,23 @@ def gmgn():
                 gmgnOptions, gmgnOptionsChoice = gmgnTools(siteChoice) 
                 print(gmgnOptionsChoice)
                 optSub = int(input("\n[❓] Choice > "))
-                if optSub not in [1, 2, 3, 4]:
+                if optSub not in [1, 2, 3, 4, 5, 6]:
                     print("[🐲] Invalid choice.")
                     continue
-                threads = getThreads()
+                if optSub == 6:
+                    sources = getWalletSources()
+                    threads = getThreads()
+                    useProxies = getProxiesSetting()
+                    skipWallets = promptSkipWallets()
+                    Dragon.walletPipeline(gmgnInstance.siteContracts(siteChoice, useProxies), sources, threads, useProxies, skipWallets)
+                    print(optionsChoice)
+                    continue
+                if optSub == 5:
+                    interval = float(input("[❓] Poll interval in seconds > "))
+                    useProxies = getProxiesSetting()
+                    gmgnInstance.watch(interval, useProxies)
+                    print(optionsChoice)
+                    continue
                 useProxies = getProxiesSetting()
                 if optSub == 1:
                     urlIndicator = "NewToken"
@@ -122,7 +213,7 @@ def gmgn():
                     urlIndicator = "SoaringToken"
                 else:
                     urlIndicator = "BondedToken"
-                gmgnInstance.contractsData(urlIndicator, threads, useProxies, siteChoice)
+                gmgnInstance.contractsData(urlIndicator, useProxies, siteChoice)
                 print(optionsChoice)
             else:
                 print("[🐲] Invalid choice.")
@@ -132,10 +223,10 @@ def gmgn():
             print(bannerText, optionsChoice, "[🐲] Invalid input.")
 
 def eth():
-    walletCheck = EthBulkWalletChecker()
-    topTradersInstance = EthTopTraders()
-    timestampInstance = EthTimestampTransactions()
-    scanInstance = EthScanAllTx()
+    walletCheck = Dragon.EthBulkWalletChecker()
+    topTradersInstance = Dragon.EthTopTraders()
+    timestampInstance = Dragon.EthTimestampTransactions()
+    scanInstance = Dragon.EthScanAllTx()
 
     filesChoice, files = utils.searchForTxt(chain="Ethereum")
     options, optionsChoice = utils.choices(chain="Ethereum")
@@ -152,7 +243,7 @@ def eth():
                     print("[🐲] No files available.")
                     print(optionsChoice)
                     continue
-                wallets = selectFile("Ethereum")
+                wallets = selectFile("Ethereum", lazy=True)
                 threads = getThreads()
                 useProxies = getProxiesSetting()
                 skipWallets = promptSkipWallets()
@@ -170,20 +261,21 @@ def eth():
                     print("[🐲] Tokens file is empty.")
                 print(optionsChoice)
             elif optInput == 4:
-                contractAddress = getContractAddress("Ethereum", [40, 41, 42])
+                contractAddress = getContractAddress([40, 41, 42])
                 threads = getThreads()
                 useProxies = getProxiesSetting()
-                scanInstance.getAllTxMakers(contractAddress, threads, useProxies)
+                useStore = promptUseStore()
+                scanInstance.getAllTxMakers(contractAddress, threads, useProxies, useStore)
                 print(optionsChoice)
             elif optInput == 5:
-                contractAddress = getContractAddress("Ethereum", [40, 41, 42])
+                contractAddress = getContractAddress([40, 41, 42])
                 threads = getThreads()
                 useProxies = getProxiesSetting()
                 print("[🐲] Get UNIX Timestamps here > https://www.unixtimestamp.com")
-                print(f"[🐲] This token was minted at {timestampInstance.getMintTimestamp(contractAddress)}")
-                startTimestamp = int(input("[❓] Start UNIX Timestamp > "))
-                endTimestamp = int(input("[❓] End UNIX Timestamp > "))
-                timestampInstance.getTxByTimestamp(contractAddress, threads, startTimestamp, endTimestamp, useProxies)
+                print(f"[🐲] This token was minted at {timestampInstance.getMintTimestamp(contractAddress, useProxies)}")
+                startTimestamp, endTimestamp = getTimestampWindows()
+                useStore = promptUseStore()
+                timestampInstance.getTxByTimestamp(contractAddress, threads, startTimestamp, endTimestamp, useProxies, useStore)
                 print(optionsChoice)
             elif optInput == 6:
                 purgeFilesUtil(chain="Ethereum")
@@ -201,14 +293,14 @@ def eth():
 
 
 def solana():
-    timestampInstance = TimestampTransactions()
-    bundleInstance = BundleFinder()
-    scanInstance = ScanAllTx()
-    walletCheck = BulkWalletChecker()
-    topTradersInstance = TopTraders()
-    copyTradeInstance = CopyTradeWalletFinder()
-    topHoldersInstance = TopHolders()
-    earlyBuyersInstance = EarlyBuyers()
+    timestampInstance = Dragon.TimestampTransactions()
+    bundleInstance = Dragon.BundleFinder()
+    scanInstance = Dragon.ScanAllTx()
+    walletCheck = Dragon.BulkWalletChecker()
+    topTradersInstance = Dragon.TopTraders()
+    copyTradeInstance = Dragon.CopyTradeWalletFinder()
+    topHoldersInstance = Dragon.TopHolders()
+    earlyBuyersInstance = Dragon.EarlyBuyers()
 
     options, optionsChoice = utils.choices(chain="Solana")
     print(optionsChoice)
@@ -221,47 +313,73 @@ def solana():
 
             print(f"[🐲] Selected {options[optInput - 1]}")
             if optInput == 1:
+                if promptBatch("check every token in a file"):
+                    contractAddresses = selectFile("Solana")
+                    threads = getThreads()
+                    sameSlot = promptSameSlot()
+                    useProxies = getProxiesSetting()
+                    bundleInstance.checkTokens(contractAddresses, threads, sameSlot, useProxies=useProxies)
+                    print(optionsChoice)
+                    continue
                 contractAddress = getContractAddress([43, 44])
-                txHashes = bundleInstance.teamTrades(contractAddress)
+                try:
+                    txHashes = bundleInstance.teamTrades(contractAddress)
+                except Exception as e:
+                    print(f"[🐲] Could not fetch team trades for {contractAddress}: {e}")
+                    print(optionsChoice)
+                    continue
                 bundleData = bundleInstance.checkBundle(txHashes[0], txHashes[1])
                 print(bundleInstance.prettyPrint(bundleData, contractAddress))
                 print(optionsChoice)
             elif optInput == 2:
-                wallets = selectFile("Solana")
-                threads = getThreads()
+                wallets = selectFile("Solana", lazy=True)
+                threads = getThreads(asyncCapable=True)
                 useProxies = getProxiesSetting()
                 skipWallets = promptSkipWallets()
-                walletCheck.fetchWalletData(wallets, threads=threads, skipWallets=skipWallets, useProxies=useProxies)
+                resume = promptResume()
+                walletCheck.fetchWalletData(wallets, threads=threads, skipWallets=skipWallets, useProxies=useProxies, resume=resume)
                 print(optionsChoice)
             elif optInput == 3:
                 contractAddresses = selectFile("Solana")
-                threads = getThreads()
+                threads = getThreads(asyncCapable=True)
                 useProxies = getProxiesSetting()
                 topTradersInstance.topTraderData(contractAddresses, threads, useProxies)
                 print(optionsChoice)
             elif optInput == 4:
-                contractAddress = getContractAddress("Solana", [43, 44])
+                contractAddress = getContractAddress([43, 44])
                 threads = getThreads()
                 useProxies = getProxiesSetting()
-                scanInstance.getAllTxMakers(contractAddress, threads, useProxies)
+                useStore = promptUseStore()
+                scanInstance.getAllTxMakers(contractAddress, threads, useProxies, useStore)
                 print(optionsChoice)
             elif optInput == 5:
-                contractAddress = getContractAddress("Solana", [43, 44])
+                contractAddress = getContractAddress([43, 44])
                 threads = getThreads()
                 useProxies = getProxiesSetting()
                 print("[🐲] Get UNIX Timestamps here > https://www.unixtimestamp.com")
                 print(f"[🐲] This token was minted at {timestampInstance.getMintTimestamp(contractAddress, useProxies)}")
-                startTimestamp = int(input("[❓] Start UNIX Timestamp > "))
-                endTimestamp = int(input("[❓] End UNIX Timestamp > "))
-                timestampInstance.getTxByTimestamp(contractAddress, threads, startTimestamp, endTimestamp, useProxies)
+                startTimestamp, endTimestamp = getTimestampWindows()
+                useStore = promptUseStore()
+                timestampInstance.getTxByTimestamp(contractAddress, threads, startTimestamp, endTimestamp, useProxies, useStore)
             elif optInput == 6:
-                contractAddress = getContractAddress("Solana", [43, 44])
-                walletAddress = getContractAddress("Solana", [43, 44])
-                threads = getThreads()
-                useProxies = getProxiesSetting()
-                copyTradeInstance.findWallets(contractAddress, walletAddress, threads, useProxies)
+                if promptBatch("many leader wallets across many tokens"):
+                    print("[🐲] Select the leader wallets file.")
+                    leaders = selectFile("Solana")
+                    print("[🐲] Select the tokens file.")
+                    contractAddresses = selectFile("Solana")
+                    seconds, trades, minTokens = getCopyWindow()
+                    threads = getThreads()
+                    useProxies = getProxiesSetting()
+                    useStore = promptUseStore()
+                    copyTradeInstance.findCopyTraders(contractAddresses, leaders, threads, useProxies, seconds, trades, minTokens, useStore)
+                else:
+                    contractAddress = getContractAddress([43, 44])
+                    walletAddress = getContractAddress([43, 44])
+                    threads = getThreads()
+                    useProxies = getProxiesSetting()
+                    copyTradeInstance.findWallets(contractAddress, walletAddress, threads, useProxies)
             elif optInput == 7:
-                threads = getThreads()
+                threads = getThreads(asyncCapable=True)
                 useProxies = getProxiesSetting()
                 with open('Dragon/data/Solana/TopHolders/tokens.txt', 'r') as fp:
                     contractAddresses = fp.read().splitlines()
@@ -275,7 +393,7 @@ def solana():
                 if buyers > 100:
                     print("[🐲] Maximum early buyers is 100. Defaulting to 40.")
                     buyers = 40
-                threads = getThreads()
+                threads = getThreads(asyncCapable=True)
                 useProxies = getProxiesSetting()
                 earlyBuyersInstance.earlyBuyersdata(contractAddresses, threads, useProxies, buyers)
             elif optInput == 9:
@@ -290,8 +408,8 @@ def solana():
             print(optionsChoice)
 
 def bsc():
-    walletCheck = BscBulkWalletChecker()
-    topTradersInstance = BscTopTraders()
+    walletCheck = Dragon.BscBulkWalletChecker()
+    topTradersInstance = Dragon.BscTopTraders()
 
     filesChoice, files = utils.searchForTxt(chain="Binance Smart Chain")
     options, optionsChoice = utils.choices(chain="Binance Smart Chain")
@@ -309,7 +427,7 @@ def bsc():
                     print("[🐲] No files available.")
                     print(optionsChoice)
                     continue
-                wallets = selectFile("Binance Smart Chain")
+                wallets = selectFile("Binance Smart Chain", lazy=True)
                 threads = getThreads()
                 useProxies = getProxiesSetting()
                 skipWallets = promptSkipWallets()
@@ -336,7 +454,246 @@ def bsc():
             clearScreen()
             print(bannerText, optionsChoice, "[🐲] Invalid input.", e)
 
+# Non-interactive entry points: `python dragon.py <chain> <module> [flags]`.
+# Each one returns a dict of summary stats; the run ends with a single JSON
+# line on stdout and exit status 0 on success, 1 on failure.
+
+gmgnSites = {"pump.fun": "Pump.Fun", "moonshot": "Moonshot"}
+gmgnCategories = {"new": "NewToken", "completing": "CompletingToken", "soaring": "SoaringToken", "bonded": "BondedToken"}
+
+def readLines(path):
+    with open(path, 'r') as f:
+        items = [line.strip() for line in f if line.strip()]
+    if not items:
+        raise ValueError(f"{path} is empty")
+    return items
+
+def cliThreads(threads, asyncCapable=False):
+    maxAllowed = maxThreads(asyncCapable)
+    if threads > maxAllowed:
+        print(f"[🐲] Using a maximum of {maxAllowed} threads.")
+        return maxAllowed
+    return threads
+
+def cliProxies(useProxies):
+    if useProxies and not checkProxyFile():
+        print("[🐲] Dragon/data/Proxies/proxies.txt is empty. Continuing without proxies.")
+        return False
+    return useProxies
+
+def walletStats(checker):
+    return {"wallets": len(checker.results), "failed": checker.totalFailed, "skipped": checker.skippedWallets}
+
+def cliSolBundle(args):
+    bundleInstance = Dragon.BundleFinder()
+    if args.input:
+        bundleInstance.checkTokens(readLines(args.input), args.threads, args.same_slot, args.pages, args.proxies, args.launch_window)
+        return {}
+    txHashes, totalSupply = bundleInstance.teamTrades(args.token)
+    bundleData = bundleInstance.checkBundle(txHashes, totalSupply)
+    print(bundleInstance.prettyPrint(bundleData, args.token))
+    return {"bundleDetected": bundleData['bundleDetected'], "transactions": bundleData['transactions']}
+
+def cliSolWallets(args):
+    checker = Dragon.BulkWalletChecker()
+    checker.fetchWalletData(utils.iterLines(args.input), threads=args.threads, skipWallets=args.skip_inactive, useProxies=args.proxies, resume=args.resume)
+    return {"wallets": checker.totalWritten, "filtered": checker.totalFiltered, "resumed": checker.totalResumed,
+            "failed": checker.totalFailed, "skipped": checker.skippedWallets, "budgetExceeded": checker.budgetExceeded}
+
+def cliSolTraders(args):
+    instance = Dragon.TopTraders()
+    instance.topTraderData(readLines(args.input), args.threads, args.proxies)
+    return {"addresses": len(instance.allAddresses), "traders": instance.totalTraders}
+
+def cliSolScan(args):
+    Dragon.ScanAllTx().getAllTxMakers(args.token, args.threads, args.proxies, args.store)
+    return {}
+
+def cliSolTimestamp(args):
+    startTimestamp, endTimestamp = parseTimestampWindows(args.start, args.end)
+    Dragon.TimestampTransactions().getTxByTimestamp(args.token, args.threads, startTimestamp, endTimestamp, args.proxies, args.store)
+    return {}
+
+def cliSolCopy(args):
+    instance = Dragon.CopyTradeWalletFinder()
+    if args.leaders:
+        if not args.input:
+            raise ValueError("batch mode needs --input with the tokens")
+        if args.seconds is None and args.trades is None:
+            raise ValueError("set --seconds, --trades, or both")
+        instance.findCopyTraders(readLines(args.input), readLines(args.leaders), args.threads, args.proxies,
+                                 args.seconds, args.trades, args.min_tokens, args.store)
+    else:
+        if not args.token or not args.target:
+            raise ValueError("set --token and --target, or --leaders and --input for batch mode")
+        instance.findWallets(args.token, args.target, args.threads, args.proxies)
+    return {}
+
+def cliSolHolders(args):
+    instance = Dragon.TopHolders()
+    instance.topHolderData(readLines(args.input), args.threads, args.proxies)
+    return {"addresses": len(instance.allAddresses), "holders": instance.totalTraders}
+
+def cliSolEarly(args):
+    instance = Dragon.EarlyBuyers()
+    instance.earlyBuyersdata(readLines(args.input), args.threads, args.proxies, min(args.buyers, 100))
+    return {"addresses": len(instance.allAddresses), "buyers": instance.totalBuyers}
+
+def cliEthWallets(args):
+    checker = Dragon.EthBulkWalletChecker()
+    checker.fetchWalletData(utils.iterLines(args.input), threads=args.threads, skipWallets=args.skip_inactive, useProxies=args.proxies)
+    return walletStats(checker)
+
+def cliEthTraders(args):
+    instance = Dragon.EthTopTraders()
+    instance.topTraderData(readLines(args.input), args.threads, args.proxies)
+    return {"addresses": len(instance.allAddresses), "traders": instance.totalTraders}
+
+def cliEthScan(args):
+    Dragon.EthScanAllTx().getAllTxMakers(args.token, args.threads, args.proxies, args.store)
+    return {}
+
+def cliEthTimestamp(args):
+    startTimestamp, endTimestamp = parseTimestampWindows(args.start, args.end)
+    Dragon.EthTimestampTransactions().getTxByTimestamp(args.token, args.threads, startTimestamp, endTimestamp, args.proxies, args.store)
+    return {}
+
+def cliBscWallets(args):
+    checker = Dragon.BscBulkWalletChecker()
+    checker.fetchWalletData(utils.iterLines(args.input), threads=args.threads, skipWallets=args.skip_inactive, useProxies=args.proxies)
+    return walletStats(checker)
+
+def cliBscTraders(args):
+    instance = Dragon.BscTopTraders()
+    instance.topTraderData(readLines(args.input), args.threads, args.proxies)
+    return {"addresses": len(instance.allAddresses), "traders": instance.totalTraders}
+
+def cliGmgnScrape(args):
+    Dragon.GMGN().contractsData(gmgnCategories[args.category], args.proxies, gmgnSites[args.site])
+    return {}
+
+def cliGmgnWatch(args):
+    Dragon.GMGN().watch(args.interval, args.proxies, ticks=args.ticks)
+    return {}
+
+def cliGmgnPipeline(args):
+    tokens = readLines(args.input) if args.input else Dragon.GMGN().siteContracts(gmgnSites[args.site], args.proxies)
+    checker = Dragon.walletPipeline(tokens, args.sources.split(","), args.threads, args.proxies, args.skip_inactive, args.buyers)
+    return {"wallets": checker.totalWritten, "filtered": checker.totalFiltered, "failed": checker.totalFailed,
+            "skipped": checker.skippedWallets, "budgetExceeded": checker.budgetExceeded}
+
+def addCommand(modules, name, handler, help, threads=True, proxies=True, asyncCapable=False):
+    command = modules.add_parser(name, help=help)
+    command.set_defaults(handler=handler, asyncCapable=asyncCapable)
+    if threads:
+        command.add_argument("--threads", type=int, default=40, help="Concurrent requests (default 40)")
+    if proxies:
+        command.add_argument("--proxies", action="store_true", help="Rotate through Dragon/data/Proxies/proxies.txt")
+    return command
+
+def buildParser():
+    parser = argparse.ArgumentParser(description="Dragon. Run without a command for the interactive menus.")
+    parser.add_argument("--no-cache", action="store_true", help="Always hit the API instead of reusing cached responses")
+    parser.add_argument("--max-age", type=float, default=None, help="Only reuse cached responses younger than this many seconds")
+    parser.add_argument("--time-budget", type=float, default=None, help="Stop retrying and starting requests after this many seconds")
+    chains = parser.add_subparsers(dest="chain", metavar="{sol,eth,bsc,gmgn}")
+
+    sol = chains.add_parser("sol", help="Solana modules").add_subparsers(dest="module", required=True)
+    command = addCommand(sol, "bundle", cliSolBundle, "Bundle checker")
+    target = command.add_mutually_exclusive_group(required=True)
+    target.add_argument("--token", help="Contract address")
+    target.add_argument("--input", help="File of contract addresses, checked as a batch")
+    command.add_argument("--same-slot", action="store_true", help="Batch: detect from trade history only, no solana.fm lookups")
+    command.add_argument("--pages", type=int, default=5, help="Batch with --same-slot: at most this many trade pages per token (default 5)")
+    command.add_argument("--launch-window", type=int, default=60, help="Batch with --same-slot: seconds after launch to look for bundles (default 60)")
+    command = addCommand(sol, "wallets", cliSolWallets, "Bulk wallet checker", asyncCapable=True)
+    command.add_argument("--input", required=True, help="File of wallet addresses, read as it goes; - for stdin")
+    command.add_argument("--skip-inactive", action="store_true", help="Skip wallets with no buys in 30d")
+    command.add_argument("--resume", action="store_true", help="Skip wallets already in wallets_1.csv or checked by the last run")
+    for name, handler, help in [("traders", cliSolTraders, "Top traders scraper"), ("holders", cliSolHolders, "Top holders scraper")]:
+        addCommand(sol, name, handler, help, asyncCapable=True).add_argument("--input", required=True, help="File of contract addresses")
+    command = addCommand(sol, "early", cliSolEarly, "Early buyers scraper", asyncCapable=True)
+    command.add_argument("--input", required=True, help="File of contract addresses")
+    command.add_argument("--buyers", type=int, default=40, help="Early buyers per token, at most 100 (default 40)")
+    command = addCommand(sol, "scan", cliSolScan, "All transaction scan")
+    command.add_argument("--token", required=True, help="Contract address")
+    command.add_argument("--store", action="store_true", help="Sync into the local trade store and query it")
+    command = addCommand(sol, "timestamp", cliSolTimestamp, "Transactions by timestamp")
+    command.add_argument("--token", required=True, help="Contract address")
+    command.add_argument("--start", required=True, help="Start UNIX timestamp(s), comma separated")
+    command.add_argument("--end", required=True, help="End UNIX timestamp(s), comma separated")
+    command.add_argument("--store", action="store_true", help="Sync into the local trade store and query it")
+    command = addCommand(sol, "copy", cliSolCopy, "Copy wallet finder; batch mode with --leaders")
+    command.add_argument("--token", help="Contract address")
+    command.add_argument("--target", help="Wallet to find the followers of")
+    command.add_argument("--leaders", help="Batch: file of leader wallets")
+    command.add_argument("--input", help="Batch: file of contract addresses")
+    command.add_argument("--seconds", type=int, default=None, help="Batch: follow window in seconds")
+    command.add_argument("--trades", type=int, default=None, help="Batch: follow window in buys")
+    command.add_argument("--min-tokens", type=int, default=2, help="Batch: minimum tokens followed in (default 2)")
+    command.add_argument("--store", action="store_true", help="Batch: sync into the local trade store and query it")
+
+    eth = chains.add_parser("eth", help="Ethereum modules").add_subparsers(dest="module", required=True)
+    command = addCommand(eth, "wallets", cliEthWallets, "Bulk wallet checker")
+    command.add_argument("--input", required=True, help="File of wallet addresses, read as it goes; - for stdin")
+    command.add_argument("--skip-inactive", action="store_true", help="Skip wallets with no buys in 30d")
+    addCommand(eth, "traders", cliEthTraders, "Top traders scraper").add_argument("--input", required=True, help="File of contract addresses")
+    command = addCommand(eth, "scan", cliEthScan, "All transaction scan")
+    command.add_argument("--token", required=True, help="Contract address")
+    command.add_argument("--store", action="store_true", help="Sync into the local trade store and query it")
+    command = addCommand(eth, "timestamp", cliEthTimestamp, "Transactions by timestamp")
+    command.add_argument("--token", required=True, help="Contract address")
+    command.add_argument("--start", required=True, help="Start UNIX timestamp(s), comma separated")
+    command.add_argument("--end", required=True, help="End UNIX timestamp(s), comma separated")
+    command.add_argument("--store", action="store_true", help="Sync into the local trade store and query it")
+
+    bsc = chains.add_parser("bsc", help="Binance Smart Chain modules").add_subparsers(dest="module", required=True)
+    command = addCommand(bsc, "wallets", cliBscWallets, "Bulk wallet checker")
+    command.add_argument("--input", required=True, help="File of wallet addresses, read as it goes; - for stdin")
+    command.add_argument("--skip-inactive", action="store_true", help="Skip wallets with no buys in 30d")
+    addCommand(bsc, "traders", cliBscTraders, "Top traders scraper").add_argument("--input", required=True, help="File of contract addresses")
+
+    gmgnTool = chains.add_parser("gmgn", help="GMGN tools").add_subparsers(dest="module", required=True)
+    command = addCommand(gmgnTool, "scrape", cliGmgnScrape, "Scrape one ranking", threads=False)
+    command.add_argument("--site", choices=gmgnSites, required=True)
+    command.add_argument("--category", choices=gmgnCategories, required=True)
+    command = addCommand(gmgnTool, "watch", cliGmgnWatch, "Append new tokens from every ranking to the feed", threads=False)
+    command.add_argument("--interval", type=float, default=10.0, help="Seconds between polls (default 10)")
+    command.add_argument("--ticks", type=int, default=None, help="Stop after this many polls")
+    command = addCommand(gmgnTool, "pipeline", cliGmgnPipeline, "Tokens -> wallets -> wallet checker")
+    source = command.add_mutually_exclusive_group(required=True)
+    source.add_argument("--site", choices=gmgnSites, help="Take tokens from every ranking of this site")
+    source.add_argument("--input", help="Take tokens from this file")
+    command.add_argument("--sources", default="traders", help="Comma separated: traders, holders, early (default traders)")
+    command.add_argument("--buyers", type=int, default=40, help="Early buyers per token (default 40)")
+    command.add_argument("--skip-inactive", action="store_true", help="Skip wallets with no buys in 30d")
+    return parser
+
+def runCommand(args):
+    if getattr(args, "threads", None) is not None:
+        args.threads = cliThreads(args.threads, args.asyncCapable)
+    if getattr(args, "proxies", False):
+        args.proxies = cliProxies(args.proxies)
+
+    started = time.monotonic()
+    summary = {"command": f"{args.chain} {args.module}", "status": "ok"}
+    try:
+        summary.update(args.handler(args) or {})
+    except KeyboardInterrupt:
+        summary["status"] = "interrupted"
+    except Exception as e:
+        summary.update(status="error", error=str(e))
+    summary.update(seconds=round(time.monotonic() - started, 2), cacheHits=responseCache.hits, cacheMisses=responseCache.misses)
+    print(json.dumps(summary))
+    return {"ok": 0, "error": 1, "interrupted": 130}[summary["status"]]
+
 if __name__ == "__main__":
+    args = buildParser().parse_args()
+    responseCache.configure(enabled=not args.no_cache, maxAge=args.max_age)
+    runBudget.start(args.time_budget)
+    if args.chain:
+        sys.exit(runCommand(args))
+
     print(bannerText)
     chains, chainsChoice = utils.chains()
     print(chainsChoice)
@@ -2,6 +2,8 @@ import csv
 import os
 import sys
 
+from Dragon.filters import csvColumn, stageFilter
+
 
 def extract_wallet_column_filtered(
 	input_csv_path: str,
@@ -10,8 +12,9 @@ def extract_wallet_column_filtered(
 	"""Extract wallet values from CSV to a .txt file if filters match.
 
 	- Column match is case-insensitive; prefers 'Identifier' if present, otherwise 'wallet'.
-	- Includes a row only if: Koefficient > 0.5 AND Single buy < 160.
-	- Skips rows where required numeric fields are missing or invalid.
+	- Includes a row only if it passes the [extractor] rules in Dragon/data/filters.txt
+	  (by default Koefficient > 0.5 AND Single buy < 160).
+	- A row whose value is missing or invalid fails the rules that use it.
 	"""
 
 	if not os.path.isfile(input_csv_path):
@@ -41,35 +44,28 @@ def extract_wallet_column_filtered(
 				+ ", ".join(reader.fieldnames)
 			)
 
-		# Resolve filter columns
-		coeff_key = lower_to_actual.get("koefficient")
-		single_buy_key = lower_to_actual.get("single buy")
-		if coeff_key is None or single_buy_key is None:
+		# Resolve filter columns (case-insensitive, like the wallet column)
+		wallet_filter = stageFilter("extractor")
+		filter_cols = {name for rule in wallet_filter.rules for name in rule.names}
+		missing_cols = [name for name in filter_cols if name.strip().lower() not in lower_to_actual]
+		if missing_cols:
 			raise KeyError(
-				"Required columns missing. Need 'Koefficient' and 'Single buy'. Columns present: "
-				+ ", ".join(reader.fieldnames)
+				"Required columns missing. Filters need: " + ", ".join(sorted(missing_cols))
+				+ ". Columns present: " + ", ".join(reader.fieldnames)
 			)
 
-		included_count = 0
-		row_count = 0
-		skipped_invalid_numeric = 0
+		rows = list(reader)
+		row_count = len(rows)
+		values = {
+			name: csvColumn([row.get(lower_to_actual[name.strip().lower()]) for row in rows])
+			for name in filter_cols
+		}
+		passed, failures = wallet_filter.apply(values, row_count)
 
+		included_count = 0
 		with open(output_txt_path, mode="w", encoding="utf-8", newline="") as out_file:
-			for row in reader:
-				row_count += 1
-
-				# Parse numeric filters
-				coeff_raw = row.get(coeff_key, "")
-				single_buy_raw = row.get(single_buy_key, "")
-
-				try:
-					coeff_val = float(str(coeff_raw).strip())
-					single_buy_val = float(str(single_buy_raw).strip())
-				except (ValueError, TypeError):
-					skipped_invalid_numeric += 1
-					continue
-
-				if coeff_val > 0.5 and single_buy_val < 160:
+			for row, keep in zip(rows, passed.tolist()):
+				if keep:
 					wallet_value = row.get(target_col, "")
 					if wallet_value is None:
 						wallet_value = ""
@@ -80,7 +76,7 @@ def extract_wallet_column_filtered(
 
 	print(f"Processed {row_count} data rows from CSV (excluding header)")
 	print(f"Wrote {included_count} wallet(s) meeting filters to TXT file")
-	print(f"Rows skipped due to invalid/missing numeric values: {skipped_invalid_numeric}")
+	print(f"Rows rejected per filter rule: {wallet_filter.report(failures) or 'none'}")
 
 
 def _default_paths() -> tuple[str, str]:
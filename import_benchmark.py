@@ -0,0 +1,49 @@
+import sys
+import statistics
+import subprocess
+
+# Cold-start cost of Dragon's entry points. Every sample runs in a fresh
+# interpreter, so nothing is imported yet, and times only the import itself.
+#   python import_benchmark.py [runs]
+
+entryPoints = {
+    "import Dragon": "import Dragon",
+    "dragon.py startup": "import runpy, sys; sys.argv = ['dragon.py', '--help']; exec('try:\\n runpy.run_path(\"dragon.py\", run_name=\"__main__\")\\nexcept SystemExit: pass')",
+    "sol wallets": "import Dragon; Dragon.BulkWalletChecker",
+    "sol bundle": "import Dragon; Dragon.BundleFinder",
+    "sol scan": "import Dragon; Dragon.ScanAllTx",
+    "eth wallets": "import Dragon; Dragon.EthBulkWalletChecker",
+    "gmgn watch": "import Dragon; Dragon.GMGN",
+    "gmgn pipeline": "import Dragon; Dragon.walletPipeline",
+    "first request": "import Dragon; Dragon.transport.session()",
+    "everything": "import Dragon; [getattr(Dragon, name) for name in Dragon.lazyNames]; Dragon.transport.session()",
+}
+
+heavyModules = ["asyncio", "tls_client", "fake_useragent", "aiohttp", "numpy", "sqlite3"]
+
+probe = (
+    "import sys, time, io, contextlib\n"
+    "started = time.perf_counter()\n"
+    "with contextlib.redirect_stdout(io.StringIO()):\n"
+    "    exec({code!r})\n"
+    "elapsed = (time.perf_counter() - started) * 1000\n"
+    "print(elapsed, ','.join(name for name in {heavy!r} if name in sys.modules))\n"
+)
+
+
+def measure(code, runs):
+    samples, loaded = [], ""
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", probe.format(code=code, heavy=heavyModules)],
+                                capture_output=True, text=True, check=True).stdout.split()
+        samples.append(float(output[0]))
+        loaded = output[1] if len(output) > 1 else "-"
+    return statistics.median(samples), loaded
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'entry point':<20} {'median ms':>10}  heavy modules loaded")
+    for name, code in entryPoints.items():
+        median, loaded = measure(code, runs)
+        print(f"{name:<20} {median:>10.1f}  {loaded}")
@@ -8,6 +8,8 @@ import msvcrt
 from telethon import TelegramClient, events
 from telethon.errors import ApiIdInvalidError
 from openpyxl import load_workbook
+from Dragon.filters import csvColumn, stageFilter
+from Dragon.metrics import column
 
 # ─── CONFIG ────────────────────────────────────────────────────────────────
 API_ID = 25588027
@@ -21,8 +23,9 @@ WALLET_FILE_NAME = "wallets_1.txt"
 WALLET_CSV_NAME  = "wallets_1.csv"
 
 OUTPUT_FILE      = os.path.join(DATA_DIR, "results.xlsx")
-MIN_TRADED       = 100
-MIN_WINRATE      = 35
+# [extractor] rules drop CSV rows before they are sent, [telegram] rules
+# judge the bot's replies.
+FILTERS_FILE     = os.path.join(BASE_DIR, "Dragon", "data", "filters.txt")
 RESPONSE_TIMEOUT = 9
 DELAY_BETWEEN    = 5
 BATCH_SIZE       = 10
@@ -81,14 +84,24 @@ async def send_and_collect():
                         break
                 if target_col is None:
                     raise KeyError("CSV missing 'Identifier' or 'wallet' column.")
-                for row in reader:
+                rows = list(reader)
+                csv_filter = stageFilter("extractor", FILTERS_FILE)
+                filter_cols = {name for rule in csv_filter.rules for name in rule.names}
+                unknown = [name for name in filter_cols if name.strip().lower() not in lower_to_actual]
+                if unknown:
+                    raise KeyError(f"CSV missing filter column(s): {', '.join(sorted(unknown))}")
+                values = {name: csvColumn([row.get(lower_to_actual[name.strip().lower()]) for row in rows]) for name in filter_cols}
+                passed, failures = csv_filter.apply(values, len(rows))
+                for row, keep in zip(rows, passed.tolist()):
                     value = row.get(target_col, "")
-                    if value is None:
+                    if value is None or not keep:
                         continue
                     value = str(value).strip()
                     if value:
                         wallets.append(value)
-            print(f"Loaded {len(wallets)} wallets from CSV: {wallets_csv_path}")
+            print(f"Loaded {len(wallets)} of {len(rows)} wallets from CSV: {wallets_csv_path}")
+            if not passed.all():
+                print(f"Rejected before sending: {csv_filter.report(failures)}")
         except Exception as e:
             print(f"Failed to read CSV, falling back to TXT. Reason: {e}")
 
@@ -101,6 +114,8 @@ async def send_and_collect():
         print("No wallets loaded. Ensure wallets_1.csv or wallets_1.txt exists and is valid.")
         return
 
+    reply_filter = stageFilter("telegram", FILTERS_FILE)
+
     # 4) regex patterns
     pattern = re.compile(
         r"PNL:\s*\*\*\$?(-?\d+\.?\d*)\*\*\s*"
@@ -212,16 +227,14 @@ async def send_and_collect():
                         first_profit_val = num_ * mult
 
                     # filters
-                    if traded_val < MIN_TRADED:
-                        print(f"<<< {prefix}Skipping: traded {traded_val} < {MIN_TRADED}.\n")
-                    elif winrate_val <= MIN_WINRATE:
-                        print(f"<<< {prefix}Skipping: winrate {winrate_val}% ≤ {MIN_WINRATE}%.\n")
-                    elif pnl_val * 10 < traded_val * single_buy_val:
-                        print(f"<<< {prefix}Skipping: pnl*10 < traded*single_buy.\n")
-                    elif pnl_val > traded_val * single_buy_val:
-                        print(f"<<< {prefix}Skipping: pnl < traded*single_buy.\n")
-                    elif first_profit_val is not None and first_profit_val > 0.5 * pnl_val:
-                        print(f"<<< {prefix}Skipping: first-token profit too large.\n")
+                    reply_values = {
+                        "pnl": pnl_val, "winrate": winrate_val, "traded": traded_val,
+                        "single_buy": single_buy_val, "first_profit": first_profit_val,
+                    }
+                    _, failures = reply_filter.apply({name: column([value]) for name, value in reply_values.items()}, 1)
+                    failed = [rule.source for rule, rejected in failures if rejected[0]]
+                    if failed:
+                        print(f"<<< {prefix}Skipping: {failed[0]}.\n")
                     else:
                         batch.append({
                             "wallet":     wallet,